@@ -268,6 +268,12 @@ def send_email_async(species, confidence_layer1, confidence_layer2, snapshot_pat
         user_id (ObjectId): User ID
     """
     def send_thread():
+        from utils.verification import wait_for_snapshot
+        
+        # Snapshots are written in the background; make sure it's on disk
+        if snapshot_path:
+            wait_for_snapshot(snapshot_path)
+        
         success = send_email_sync(
             species=species,
             confidence_layer1=confidence_layer1,
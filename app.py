@@ -21,8 +21,6 @@ from ui.styles import load_custom_css
 from ui.auth_pages import show_auth_page
 from ui.home_page import show_home_page
 from ui.dashboard import show_dashboard
-from ui.webcam_page import show_webcam_page
-from ui.upload_page import show_upload_page
 
 
 def main():
@@ -175,10 +173,13 @@ def main():
     elif page == "📊 Dashboard":
         show_dashboard()
     
+    # Detection pages pull in OpenCV/Ultralytics, so import them on first visit
     elif page == "📹 Webcam Detection":
+        from ui.webcam_page import show_webcam_page
         show_webcam_page()
     
     elif page == "📤 Upload Image":
+        from ui.upload_page import show_upload_page
         show_upload_page()
 
 
@@ -90,10 +90,15 @@ WEBCAM_FPS = 30
 
 # Frame processing
 PROCESS_EVERY_N_FRAMES = 2  # Process every 2nd frame for performance
+MAX_FRAME_SKIP = 30  # Adaptive skip ceiling (~1 keyframe per second at 30 FPS)
+LABEL_MIN_FPS = 10  # Below this display FPS, webcam boxes are drawn without labels
 
 # Video quality
 VIDEO_QUALITY = 85  # JPEG quality for streaming
 
+# Uploads larger than this (longest side, px) are downscaled before detection
+MAX_INFER_DIM = 1280
+
 # ==================== UI THEME ====================
 # Color scheme
 PRIMARY_COLOR = "#1a4d2e"      # Deep Forest Green
@@ -117,8 +122,17 @@ SESSION_TIMEOUT = 60
 # Model device (use "cpu" if no GPU available)
 DEVICE = "cpu"  # Set to "0" for GPU, "cpu" for CPU-only
 
+# FP16 inference on GPU (CPU FP16 is slower, so it stays FP32 there)
+HALF_PRECISION = DEVICE != "cpu"
+
 # Image size for inference (from training config)
 INFERENCE_SIZE = 416
 
+# Real-time webcam path runs an exported model (TensorRT FP16 on CUDA,
+# ONNX otherwise); verification keeps the PyTorch model
+USE_FAST_MODEL = True
+FAST_MODEL_PATH = MODEL_PATH.with_suffix(".onnx")
+TRT_ENGINE_PATH = MODEL_PATH.with_suffix(".engine")
+
 # Maximum concurrent detections
 MAX_CONCURRENT_DETECTIONS = 10
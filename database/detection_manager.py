@@ -55,6 +55,51 @@ def save_detection(user_id, species, confidence_layer1, confidence_layer2,
         return None
 
 
+def save_detections_bulk(rows):
+    """
+    Save several detections to the database in a single round-trip.
+    
+    Args:
+        rows (list): List of dicts with the same keys as save_detection's
+            arguments (user_id, species, confidence_layer1, confidence_layer2,
+            snapshot_path, and optionally verification_status, alert_sent, source)
+        
+    Returns:
+        list: Detection IDs in the same order as rows, or [] if failed
+    """
+    if not rows:
+        return []
+    
+    detections_collection = get_collection(config.DETECTIONS_COLLECTION)
+    
+    if detections_collection is None:
+        return []
+    
+    try:
+        timestamp = datetime.now()
+        detection_docs = [
+            {
+                "user_id": row['user_id'],
+                "timestamp": timestamp,
+                "species": row['species'],
+                "confidence_layer1": row['confidence_layer1'],
+                "confidence_layer2": row['confidence_layer2'],
+                "snapshot_path": row['snapshot_path'],
+                "verification_status": row.get('verification_status', "verified"),
+                "alert_sent": row.get('alert_sent', False),
+                "source": row.get('source', "webcam")
+            }
+            for row in rows
+        ]
+        
+        result = detections_collection.insert_many(detection_docs)
+        return list(result.inserted_ids)
+    
+    except Exception as e:
+        st.error(f"Error saving detections: {e}")
+        return []
+
+
 def update_detection_alert_status(detection_id, alert_sent=True):
     """
     Update the alert_sent status for a detection.
@@ -86,6 +131,38 @@ def update_detection_alert_status(detection_id, alert_sent=True):
         return False
 
 
+def update_detection_alert_status_bulk(detection_ids, alert_sent=True):
+    """
+    Update the alert_sent status for several detections in one query.
+    
+    Args:
+        detection_ids (list): Detection IDs to update
+        alert_sent (bool): Whether alert was sent
+        
+    Returns:
+        int: Number of detections updated
+    """
+    if not detection_ids:
+        return 0
+    
+    try:
+        collection = get_collection(config.DETECTIONS_COLLECTION)
+        
+        if collection is None:
+            return 0
+        
+        result = collection.update_many(
+            {"_id": {"$in": [ObjectId(detection_id) for detection_id in detection_ids]}},
+            {"$set": {"alert_sent": alert_sent}}
+        )
+        
+        return result.modified_count
+        
+    except Exception as e:
+        print(f"Error updating detection alert status: {e}")
+        return 0
+
+
 def get_recent_detections(user_id, limit=20):
     """
     Get recent detections for a user.
@@ -0,0 +1,81 @@
+"""
+Tests for the bulk detection writes, against a mocked collection
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("bson")
+pytest.importorskip("streamlit")
+
+from bson.objectid import ObjectId
+
+from database import detection_manager
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    """Replace the detections collection with a mock."""
+    mock = MagicMock()
+    monkeypatch.setattr(detection_manager, "get_collection", lambda name: mock)
+    return mock
+
+
+def _row(species, **extra):
+    row = {
+        'user_id': ObjectId(),
+        'species': species,
+        'confidence_layer1': 0.9,
+        'confidence_layer2': 0.8,
+        'snapshot_path': "snap.jpg",
+    }
+    row.update(extra)
+    return row
+
+
+def test_save_detections_bulk_inserts_all_rows_in_one_call(collection):
+    ids = [ObjectId(), ObjectId()]
+    collection.insert_many.return_value.inserted_ids = ids
+
+    result = detection_manager.save_detections_bulk([_row("Tiger"), _row("Bear", source="upload")])
+
+    assert result == ids
+    collection.insert_many.assert_called_once()
+    docs = collection.insert_many.call_args.args[0]
+    assert [d['species'] for d in docs] == ["Tiger", "Bear"]
+    assert docs[0]['source'] == "webcam"
+    assert docs[1]['source'] == "upload"
+    assert docs[0]['verification_status'] == "verified"
+    assert docs[0]['alert_sent'] is False
+    # One timestamp for the whole batch
+    assert docs[0]['timestamp'] is docs[1]['timestamp']
+
+
+def test_save_detections_bulk_empty_rows_skips_database(collection):
+    assert detection_manager.save_detections_bulk([]) == []
+    collection.insert_many.assert_not_called()
+
+
+def test_save_detections_bulk_without_database(monkeypatch):
+    monkeypatch.setattr(detection_manager, "get_collection", lambda name: None)
+    assert detection_manager.save_detections_bulk([_row("Tiger")]) == []
+
+
+def test_update_alert_status_bulk_uses_one_in_query(collection):
+    ids = [ObjectId(), ObjectId()]
+    collection.update_many.return_value.modified_count = 2
+
+    # String IDs are converted as well
+    updated = detection_manager.update_detection_alert_status_bulk([ids[0], str(ids[1])])
+
+    assert updated == 2
+    collection.update_many.assert_called_once_with(
+        {"_id": {"$in": ids}},
+        {"$set": {"alert_sent": True}}
+    )
+
+
+def test_update_alert_status_bulk_empty_ids_skips_database(collection):
+    assert detection_manager.update_detection_alert_status_bulk([]) == 0
+    collection.update_many.assert_not_called()
@@ -0,0 +1,146 @@
+"""
+Tests for the 2-layer verification branches, with detection and snapshot
+saving mocked out
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+pytest.importorskip("ultralytics")
+
+import config
+from utils import verification
+
+
+IMAGE = np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def _det(species, confidence, bbox=(0, 0, 4, 4)):
+    return {'class_id': 0, 'class_name': species, 'confidence': confidence, 'bbox': bbox}
+
+
+@pytest.fixture
+def raw(monkeypatch):
+    """Mock the full-model pass; set .detections and read .calls."""
+    class FakeRaw:
+        detections = []
+        calls = 0
+
+        def __call__(self, image):
+            self.calls += 1
+            return list(self.detections)
+
+    fake = FakeRaw()
+    monkeypatch.setattr(verification, "detect_objects_raw", fake)
+    monkeypatch.setattr(config, "LAYER1_CONFIDENCE", 0.5)
+    monkeypatch.setattr(config, "LAYER2_CONFIDENCE", 0.4)
+    return fake
+
+
+@pytest.fixture
+def snapshots(monkeypatch):
+    """Mock save_snapshot; returns the list of saved detections."""
+    saved = []
+
+    def fake_save(image, detection, source="webcam"):
+        saved.append(detection)
+        return "snapshot.jpg"
+
+    monkeypatch.setattr(verification, "save_snapshot", fake_save)
+    return saved
+
+
+def test_no_layer1_detection_is_rejected(raw, snapshots):
+    raw.detections = [_det("Tiger", 0.45)]
+
+    result = verification.verify_detection_2layer(IMAGE)
+
+    assert not result['verified']
+    assert result['rejection_reason'] == 'No Layer 1 detection'
+    assert snapshots == []
+
+
+def test_empty_caller_layer1_skips_full_model(raw, snapshots):
+    result = verification.verify_detection_2layer(IMAGE, layer1_detections=[])
+
+    assert not result['verified']
+    assert raw.calls == 0
+
+
+def test_single_pass_serves_both_layers(raw, snapshots):
+    raw.detections = [_det("Tiger", 0.9), _det("Bear", 0.45)]
+
+    result = verification.verify_detection_2layer(IMAGE)
+
+    assert raw.calls == 1
+    assert result['verified']
+    assert [d['class_name'] for d in result['layer1_detections']] == ["Tiger"]
+    assert [d['class_name'] for d in result['layer2_detections']] == ["Tiger", "Bear"]
+    assert result['best_detection']['species'] == "Tiger"
+    assert result['snapshot_path'] == "snapshot.jpg"
+    assert snapshots == [{'class_name': "Tiger", 'confidence': 0.9}]
+
+
+def test_single_pass_rejects_when_layer2_is_stricter(raw, snapshots, monkeypatch):
+    monkeypatch.setattr(config, "LAYER2_CONFIDENCE", 0.8)
+    raw.detections = [_det("Tiger", 0.6)]
+
+    result = verification.verify_detection_2layer(IMAGE)
+
+    assert not result['verified']
+    assert result['rejection_reason'] == 'No Layer 2 detection'
+
+
+def test_caller_layer1_is_confirmed_by_full_model(raw, snapshots):
+    raw.detections = [_det("Tiger", 0.7, bbox=(1, 1, 5, 5))]
+
+    result = verification.verify_detection_2layer(IMAGE, layer1_detections=[_det("Tiger", 0.6)])
+
+    assert raw.calls == 1
+    assert result['verified']
+    assert result['best_detection']['confidence_layer1'] == 0.6
+    assert result['best_detection']['confidence_layer2'] == 0.7
+    assert result['best_detection']['bbox_layer2'] == (1, 1, 5, 5)
+
+
+def test_caller_layer1_without_layer2_is_rejected(raw, snapshots):
+    raw.detections = [_det("Tiger", 0.2)]
+
+    result = verification.verify_detection_2layer(IMAGE, layer1_detections=[_det("Tiger", 0.6)])
+
+    assert not result['verified']
+    assert result['rejection_reason'] == 'No Layer 2 detection'
+    assert snapshots == []
+
+
+def test_species_mismatch_is_rejected(raw, snapshots):
+    raw.detections = [_det("Bear", 0.9)]
+
+    result = verification.verify_detection_2layer(IMAGE, layer1_detections=[_det("Tiger", 0.6)])
+
+    assert not result['verified']
+    assert result['rejection_reason'] == "Species mismatch: L1=Tiger, L2=Bear"
+    assert snapshots == []
+
+
+def test_check_does_not_save_snapshot(raw, snapshots):
+    raw.detections = [_det("Tiger", 0.9)]
+
+    result = verification.check_detection_2layer(IMAGE)
+
+    assert result['verified']
+    assert result['snapshot_path'] is None
+    assert snapshots == []
+
+
+def test_failed_snapshot_is_rejected(raw, monkeypatch):
+    monkeypatch.setattr(verification, "save_snapshot", lambda image, detection, source="webcam": None)
+    raw.detections = [_det("Tiger", 0.9)]
+
+    result = verification.verify_detection_2layer(IMAGE)
+
+    assert not result['verified']
+    assert result['best_detection'] is None
+    assert result['rejection_reason'] == 'Snapshot save failed'
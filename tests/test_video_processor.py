@@ -0,0 +1,79 @@
+"""
+Tests for WebcamProcessor's adaptive frame skip and buffer recycling
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+pytest.importorskip("ultralytics")
+
+import config
+from utils.video_processor import WebcamProcessor
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    """Processor that is never started, at a fixed 30 FPS (33.3 ms/frame)."""
+    monkeypatch.setattr(config, "WEBCAM_FPS", 30)
+    monkeypatch.setattr(config, "PROCESS_EVERY_N_FRAMES", 2)
+    monkeypatch.setattr(config, "MAX_FRAME_SKIP", 30)
+    proc = WebcamProcessor(camera_index=0)
+    proc.frame_skip = 2
+    return proc
+
+
+def test_frame_skip_rises_immediately(processor):
+    processor.process_ms_ema = 90.0
+    assert processor.update_frame_skip() == 3
+
+
+def test_frame_skip_holds_inside_hysteresis_band(processor):
+    processor.process_ms_ema = 90.0
+    processor.update_frame_skip()
+
+    # Fits into skip 2, but not with 20% headroom (limit ~53.3 ms)
+    processor.process_ms_ema = 60.0
+    assert processor.update_frame_skip() == 3
+
+
+def test_frame_skip_drops_with_headroom(processor):
+    processor.process_ms_ema = 90.0
+    processor.update_frame_skip()
+
+    processor.process_ms_ema = 50.0
+    assert processor.update_frame_skip() == 2
+
+
+def test_frame_skip_never_below_configured_minimum(processor):
+    processor.process_ms_ema = 1.0
+    assert processor.update_frame_skip() == 2
+
+
+def test_frame_skip_capped_at_max(processor):
+    processor.process_ms_ema = 5000.0
+    assert processor.update_frame_skip() == config.MAX_FRAME_SKIP
+
+
+def test_release_buffer_only_accepts_capture_shape(processor):
+    processor._buffer_shape = (4, 4, 3)
+
+    processor.release_frame(np.zeros((2, 2, 3), dtype=np.uint8))
+    assert processor._acquire_buffer() is None
+
+    buf = np.zeros((4, 4, 3), dtype=np.uint8)
+    processor.release_frame(buf)
+    assert processor._acquire_buffer() is buf
+
+
+def test_submit_frame_recycles_replaced_pending_frame(processor):
+    processor._buffer_shape = (4, 4, 3)
+    first = np.zeros((4, 4, 3), dtype=np.uint8)
+    second = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    processor.submit_frame(first)
+    processor.submit_frame(second)
+
+    assert processor._acquire_buffer() is first
+    assert processor._pending[0] is second
@@ -0,0 +1,81 @@
+"""
+Tests for the model-free helpers in utils.yolo_detector
+"""
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("torch")
+pytest.importorskip("ultralytics")
+
+from utils.yolo_detector import (
+    _fill_label_background,
+    filter_detections_by_species,
+    get_best_detection_per_species,
+)
+
+
+COLOR = (10, 20, 30)
+
+
+def _det(species, confidence):
+    return {'class_id': 0, 'class_name': species, 'confidence': confidence, 'bbox': (0, 0, 1, 1)}
+
+
+@pytest.mark.parametrize("rect", [
+    (2, 3, 6, 5),      # fully inside
+    (-4, -2, 3, 2),    # clipped top-left
+    (5, 6, 20, 30),    # clipped bottom-right
+    (-1, -1, 10, 8),   # covers the whole image
+])
+def test_fill_label_background_matches_cv2_rectangle(rect):
+    expected = np.zeros((8, 10, 3), dtype=np.uint8)
+    cv2.rectangle(expected, rect[:2], rect[2:], COLOR, -1)
+
+    image = np.zeros((8, 10, 3), dtype=np.uint8)
+    _fill_label_background(image, *rect, COLOR)
+
+    np.testing.assert_array_equal(image, expected)
+
+
+@pytest.mark.parametrize("rect", [
+    (-10, -10, -1, -1),  # above and left of the image
+    (10, 0, 15, 4),      # right of the image
+    (0, 8, 4, 12),       # below the image
+])
+def test_fill_label_background_outside_image_is_noop(rect):
+    image = np.zeros((8, 10, 3), dtype=np.uint8)
+    _fill_label_background(image, *rect, COLOR)
+    assert not image.any()
+
+
+def test_filter_by_species_empty_list_returns_nothing():
+    assert filter_detections_by_species([_det("Tiger", 0.9)], []) == []
+
+
+def test_filter_by_species_all_species_returns_copy():
+    detections = [_det("Tiger", 0.9), _det("Bear", 0.8)]
+
+    result = filter_detections_by_species(detections, ["Bear", "Elephant", "Leopard", "Tiger"])
+
+    assert result == detections
+    assert result is not detections
+
+
+def test_filter_by_species_subset():
+    detections = [_det("Tiger", 0.9), _det("Bear", 0.8), _det("Tiger", 0.7)]
+
+    result = filter_detections_by_species(detections, ["Tiger"])
+
+    assert [d['confidence'] for d in result] == [0.9, 0.7]
+
+
+def test_best_detection_per_species_keeps_first_seen_order():
+    detections = [_det("Tiger", 0.9), _det("Bear", 0.8), _det("Tiger", 0.95), _det("Bear", 0.5)]
+
+    best = get_best_detection_per_species(detections)
+
+    assert list(best) == ["Tiger", "Bear"]
+    assert best["Tiger"]['confidence'] == 0.95
+    assert best["Bear"]['confidence'] == 0.8
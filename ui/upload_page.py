@@ -3,43 +3,277 @@ Image Upload Page
 Modern AdminLTE-inspired upload interface
 """
 
+import hashlib
+from string import Template
 import streamlit as st
-import cv2
-import numpy as np
-from PIL import Image
 from datetime import datetime
 import config
-from utils.yolo_detector import draw_boxes
-from utils.verification import verify_detection_2layer
 from database.user_manager import get_current_user_id
-from database.detection_manager import save_detection
+from database.detection_manager import save_detections_bulk, update_detection_alert_status_bulk
 from alerts.email_service import send_alert_if_ready
 from ui.styles import format_confidence, create_species_badge, create_confidence_bar
 
 
+# Static page HTML, built once at import instead of on every rerun
+_HEADER_HTML = """
+<div style="margin-bottom: 40px;">
+    <h1 style="
+        font-size: 3rem; 
+        font-weight: 900; 
+        margin-bottom: 8px;
+        background: linear-gradient(to right, #818cf8, #2dd4bf);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+    ">📤 Image Upload</h1>
+    <p style="
+        font-size: 1.125rem; 
+        color: var(--text-secondary);
+        margin: 0;
+    ">Upload wildlife images for AI-powered detection and analysis</p>
+</div>
+"""
+
+_EMPTY_STATE_HTML = """
+<div style="
+    background: linear-gradient(135deg, rgba(99, 102, 241, 0.05) 0%, rgba(16, 185, 129, 0.05) 100%);
+    border: 2px dashed var(--border-color);
+    border-radius: var(--radius-xl);
+    padding: 80px 40px;
+    text-align: center;
+    margin: 40px 0;
+">
+    <div style="font-size: 100px; margin-bottom: 20px;">📸</div>
+    <h3 style="
+        font-size: 1.5rem; 
+        font-weight: 700; 
+        color: var(--text-primary);
+        margin-bottom: 12px;
+    ">Drag and drop your image here</h3>
+    <p style="
+        font-size: 1rem; 
+        color: var(--text-secondary);
+        margin-bottom: 30px;
+    ">or click to browse your files</p>
+    <div style="
+        display: inline-block;
+        background: rgba(14, 165, 233, 0.1);
+        border: 1px solid var(--info);
+        border-radius: var(--radius-md);
+        padding: 12px 24px;
+        margin: 8px;
+    ">
+        <span style="color: var(--text-secondary); font-size: 0.875rem;">
+            ✓ JPG, JPEG, PNG supported
+        </span>
+    </div>
+    <div style="
+        display: inline-block;
+        background: rgba(14, 165, 233, 0.1);
+        border: 1px solid var(--info);
+        border-radius: var(--radius-md);
+        padding: 12px 24px;
+        margin: 8px;
+    ">
+        <span style="color: var(--text-secondary); font-size: 0.875rem;">
+            ✓ Max 10MB file size
+        </span>
+    </div>
+</div>
+"""
+
+_ORIGINAL_TITLE_HTML = """
+<h3 style="
+    font-size: 1.125rem; 
+    font-weight: 700; 
+    color: var(--text-secondary);
+    margin-bottom: 16px;
+">📷 Original Image</h3>
+"""
+
+_RESULT_TITLE_HTML = """
+<h3 style="
+    font-size: 1.125rem; 
+    font-weight: 700; 
+    color: var(--text-secondary);
+    margin-bottom: 16px;
+">✅ Detection Result</h3>
+"""
+
+_NO_DETECTION_HTML = """
+<div style="
+    background: linear-gradient(135deg, rgba(99, 102, 241, 0.05) 0%, rgba(16, 185, 129, 0.05) 100%);
+    border: 2px dashed var(--border-color);
+    border-radius: var(--radius-lg);
+    padding: 60px 30px;
+    text-align: center;
+">
+    <div style="font-size: 80px; margin-bottom: 20px; opacity: 0.5;">🔍</div>
+    <h3 style="
+        font-size: 1.25rem; 
+        font-weight: 700; 
+        color: var(--text-secondary);
+        margin-bottom: 10px;
+    ">No detections</h3>
+    <p style="color: var(--text-muted); font-size: 0.875rem;">
+        Upload image to see results
+    </p>
+</div>
+"""
+
+_TIPS = [
+    ("💡", "Best Results", "Use clear, well-lit images with visible animals"),
+    ("🎯", "Supported Species", "Tiger, Bear, Leopard, Elephant"),
+    ("⚡", "Fast Processing", "Results in seconds with 98.58% accuracy")
+]
+
+_TIP_CARDS_HTML = [
+    f"""
+<div class="card" style="text-align: center; padding: 28px 20px;">
+    <div style="font-size: 48px; margin-bottom: 16px;">{icon}</div>
+    <h4 style="
+        font-size: 1rem; 
+        font-weight: 700; 
+        color: var(--primary);
+        margin-bottom: 10px;
+    ">{title}</h4>
+    <p style="
+        font-size: 0.875rem; 
+        color: var(--text-secondary);
+        line-height: 1.5;
+        margin: 0;
+    ">{desc}</p>
+</div>
+"""
+    for icon, title, desc in _TIPS
+]
+
+
+# Dynamic result HTML, parsed once and filled per render
+_SUCCESS_TMPL = Template("""
+<div class="alert-success" style="
+    background: rgba(16, 185, 129, 0.1);
+    border: 1px solid var(--success);
+    border-radius: var(--radius-lg);
+    padding: 24px;
+    margin: 20px 0;
+    text-align: center;
+">
+    <div style="font-size: 64px; margin-bottom: 16px;">🎉</div>
+    <h2 style="
+        font-size: 1.75rem; 
+        font-weight: 800; 
+        color: var(--success);
+        margin-bottom: 8px;
+    ">Detected $count </h2>
+    <p style="color: var(--text-secondary); font-size: 1rem;">
+        2-layer verification completed successfully
+    </p>
+</div>
+""")
+
+_CARD_TMPL = Template("""
+<div class="card" style="flex: 1 1 0; padding: 28px 24px; border-top: 4px solid var(--primary);">
+    <div style="text-align: center; margin-bottom: 20px;">
+        <div style="font-size: 72px; margin-bottom: 12px;">
+            $emoji
+        </div>
+        <h3 style="
+            font-size: 1.5rem; 
+            font-weight: 800; 
+            color: var(--primary);
+            margin: 0;
+        ">$species</h3>
+    </div>
+    $bar1
+    $bar2
+</div>
+""")
+
+_NO_WILDLIFE_TMPL = Template("""
+<div class="alert-warning">
+    <h3 style="margin: 0 0 10px 0; color: var(--warning);">⚠️ No Wildlife Detected</h3>
+    <p style="margin: 0; color: var(--text-secondary);">
+        The 2-layer verification did not find any wildlife in this image.
+    </p>
+    $reason_html
+</div>
+""")
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _decode_upload(image_hash, _file_bytes):
+    """
+    Decode uploaded image bytes once per unique upload.
+    
+    Args:
+        image_hash (bytes): Digest of the uploaded file, used as the cache key
+        _file_bytes (bytes): Raw uploaded file contents, excluded from hashing
+        
+    Returns:
+        np.ndarray or None: Decoded image (BGR), downscaled to MAX_INFER_DIM,
+            or None if the bytes could not be decoded
+    """
+    import cv2
+    import numpy as np
+    
+    image_bgr = cv2.imdecode(np.frombuffer(_file_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    
+    if image_bgr is None:
+        return None
+    
+    # YOLO runs at INFERENCE_SIZE anyway; shrink huge photos once up front
+    h, w = image_bgr.shape[:2]
+    if max(h, w) > config.MAX_INFER_DIM:
+        scale = config.MAX_INFER_DIM / max(h, w)
+        image_bgr = cv2.resize(
+            image_bgr,
+            (round(w * scale), round(h * scale)),
+            interpolation=cv2.INTER_AREA
+        )
+    
+    return image_bgr
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_verify(image_hash, layer1_conf, layer2_conf, model_path, _image_bgr):
+    """
+    Run the 2-layer check once per unique image and configuration.
+    
+    Only the pure detection result is cached; the snapshot is saved by the
+    caller on each Detect click.
+    
+    The thresholds and model path are part of the cache key so a changed
+    setting or retrained model is not masked by a stale result.
+    
+    Args:
+        image_hash (bytes): Digest of the uploaded file
+        layer1_conf (float): Layer 1 confidence threshold
+        layer2_conf (float): Layer 2 confidence threshold
+        model_path (str): Path of the model weights
+        _image_bgr (np.ndarray): Decoded image (BGR), excluded from hashing
+        
+    Returns:
+        dict: Result of check_detection_2layer
+    """
+    from utils.verification import check_detection_2layer
+    
+    return check_detection_2layer(_image_bgr)
+
+
 def show_upload_page():
     """Display modern image upload page with AdminLTE-inspired design."""
     
-    user_id = get_current_user_id()
-    
     # === HEADER ===
-    st.markdown("""
-    <div style="margin-bottom: 40px;">
-        <h1 style="
-            font-size: 3rem; 
-            font-weight: 900; 
-            margin-bottom: 8px;
-            background: linear-gradient(to right, #818cf8, #2dd4bf);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        ">📤 Image Upload</h1>
-        <p style="
-            font-size: 1.125rem; 
-            color: var(--text-secondary);
-            margin: 0;
-        ">Upload wildlife images for AI-powered detection and analysis</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+    
+    _show_upload_section()
+
+
+@st.fragment
+def _show_upload_section():
+    """Upload/detect widgets; runs as a fragment so interactions skip the header."""
+    
+    user_id = get_current_user_id()
     
     # File uploader with modern styling
     uploaded_file = st.file_uploader(
@@ -51,262 +285,169 @@ def show_upload_page():
     
     if not uploaded_file:
         # Empty state
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, rgba(99, 102, 241, 0.05) 0%, rgba(16, 185, 129, 0.05) 100%);
-            border: 2px dashed var(--border-color);
-            border-radius: var(--radius-xl);
-            padding: 80px 40px;
-            text-align: center;
-            margin: 40px 0;
-        ">
-            <div style="font-size: 100px; margin-bottom: 20px;">📸</div>
-            <h3 style="
-                font-size: 1.5rem; 
-                font-weight: 700; 
-                color: var(--text-primary);
-                margin-bottom: 12px;
-            ">Drag and drop your image here</h3>
-            <p style="
-                font-size: 1rem; 
-                color: var(--text-secondary);
-                margin-bottom: 30px;
-            ">or click to browse your files</p>
-            <div style="
-                display: inline-block;
-                background: rgba(14, 165, 233, 0.1);
-                border: 1px solid var(--info);
-                border-radius: var(--radius-md);
-                padding: 12px 24px;
-                margin: 8px;
-            ">
-                <span style="color: var(--text-secondary); font-size: 0.875rem;">
-                    ✓ JPG, JPEG, PNG supported
-                </span>
-            </div>
-            <div style="
-                display: inline-block;
-                background: rgba(14, 165, 233, 0.1);
-                border: 1px solid var(--info);
-                border-radius: var(--radius-md);
-                padding: 12px 24px;
-                margin: 8px;
-            ">
-                <span style="color: var(--text-secondary); font-size: 0.875rem;">
-                    ✓ Max 10MB file size
-                </span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_EMPTY_STATE_HTML, unsafe_allow_html=True)
         
         # Tips section
         st.markdown("<br>", unsafe_allow_html=True)
         col1, col2, col3 = st.columns(3)
         
-        tips = [
-            ("💡", "Best Results", "Use clear, well-lit images with visible animals"),
-            ("🎯", "Supported Species", "Tiger, Bear, Leopard, Elephant"),
-            ("⚡", "Fast Processing", "Results in seconds with 98.58% accuracy")
-        ]
-        
-        for col, (icon, title, desc) in zip([col1, col2, col3], tips):
+        for col, tip_html in zip([col1, col2, col3], _TIP_CARDS_HTML):
             with col:
-                st.markdown(f"""
-                <div class="card" style="text-align: center; padding: 28px 20px;">
-                    <div style="font-size: 48px; margin-bottom: 16px;">{icon}</div>
-                    <h4 style="
-                        font-size: 1rem; 
-                        font-weight: 700; 
-                        color: var(--primary);
-                        margin-bottom: 10px;
-                    ">{title}</h4>
-                    <p style="
-                        font-size: 0.875rem; 
-                        color: var(--text-secondary);
-                        line-height: 1.5;
-                        margin: 0;
-                    ">{desc}</p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(tip_html, unsafe_allow_html=True)
         
         return
     
+    # Heavy CV/model imports are deferred until an image is actually uploaded
+    import cv2
+    from utils.yolo_detector import load_model, draw_boxes, get_best_detection_per_species
+    from utils.verification import save_verified_snapshot
+    
+    # Warm the cached model so the Detect spinner only covers inference
+    load_model()
+    
     # Image uploaded - show preview and detection
-    image = Image.open(uploaded_file)
-    image_np = np.array(image)
+    # Hash each upload once; file_id is stable across reruns for the same upload
+    if st.session_state.get('upload_file_id') != uploaded_file.file_id:
+        st.session_state['upload_file_id'] = uploaded_file.file_id
+        st.session_state['upload_file_hash'] = hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).digest()
+    image_hash = st.session_state['upload_file_hash']
     
-    if len(image_np.shape) == 3 and image_np.shape[2] == 3:
-        image_bgr = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
-    else:
-        st.error("❌ Invalid image format. Please upload a color image.")
+    # Reuse the decoded image across reruns until a different file arrives
+    if st.session_state.get('upload_image_hash') != image_hash:
+        st.session_state['upload_image_hash'] = image_hash
+        st.session_state['upload_image_bgr'] = _decode_upload(image_hash, uploaded_file.getvalue())
+    image_bgr = st.session_state['upload_image_bgr']
+    
+    if image_bgr is None:
+        st.error("❌ Could not decode the uploaded image. The file may be corrupt or not a supported image format.")
         return
     
+    # Channel-reversed view for display, no copy
+    image_rgb = image_bgr[..., ::-1]
+    
     # Display images side by side
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
-        <h3 style="
-            font-size: 1.125rem; 
-            font-weight: 700; 
-            color: var(--text-secondary);
-            margin-bottom: 16px;
-        ">📷 Original Image</h3>
-        """, unsafe_allow_html=True)
-        st.image(image, use_column_width=True)
+        st.markdown(_ORIGINAL_TITLE_HTML, unsafe_allow_html=True)
+        st.image(image_rgb, use_column_width=True)
     
     # Detection button
-    if st.button("🔍 Detect Wildlife", type="primary", use_container_width=True):
+    detect_clicked = st.button("🔍 Detect Wildlife", type="primary", use_container_width=True)
+    
+    if detect_clicked:
+        with st.spinner("🤖 Running 2-Layer AI Detection..."):
+            result = _cached_verify(
+                image_hash,
+                config.LAYER1_CONFIDENCE,
+                config.LAYER2_CONFIDENCE,
+                str(config.MODEL_PATH),
+                image_bgr
+            )
+            result = save_verified_snapshot(image_bgr, result)
+        st.session_state['last_detection'] = {'image_hash': image_hash, 'result': result}
+    
+    # Keep showing the last result for this image across reruns
+    last_detection = st.session_state.get('last_detection')
+    if not last_detection or last_detection['image_hash'] != image_hash:
+        return
+    
+    result = last_detection['result']
+    
+    with col2:
+        st.markdown(_RESULT_TITLE_HTML, unsafe_allow_html=True)
+    
+    if result['verified']:
+        # Display detected image
         with col2:
-            st.markdown("""
-            <h3 style="
-                font-size: 1.125rem; 
-                font-weight: 700; 
-                color: var(--text-secondary);
-                margin-bottom: 16px;
-            ">✅ Detection Result</h3>
-            """, unsafe_allow_html=True)
+            result_image = draw_boxes(image_bgr, result['layer2_detections'])
+            # Ship JPEG bytes instead of letting Streamlit PNG-encode the array
+            _, jpg_buf = cv2.imencode('.jpg', result_image, [cv2.IMWRITE_JPEG_QUALITY, config.VIDEO_QUALITY])
+            st.image(jpg_buf.tobytes(), use_column_width=True)
         
-        with st.spinner("🤖 Running 2-Layer AI Detection..."):
-            result = verify_detection_2layer(image_bgr)
+        # Get all detected species (highest-confidence detection per class)
+        detected_species = get_best_detection_per_species(result['layer2_detections'])
+        
+        # Best Layer 1 confidence per species, built once for cards and saving
+        layer1_conf_map = {
+            species: det['confidence']
+            for species, det in get_best_detection_per_species(result['layer1_detections']).items()
+        }
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        # Success message
+        st.markdown(_SUCCESS_TMPL.substitute(count=len(detected_species)), unsafe_allow_html=True)
+        
+        # Display each detected animal in cards, sent as one flexbox row
+        if detected_species:
+            cards_html = ''.join(
+                _CARD_TMPL.substitute(
+                    emoji=config.CLASS_EMOJIS.get(species, '🦁'),
+                    species=species,
+                    bar1=create_confidence_bar(layer1_conf_map.get(species, det['confidence']), "Layer 1"),
+                    bar2=create_confidence_bar(det['confidence'], "Layer 2")
+                ).strip()
+                for species, det in detected_species.items()
+            )
+            st.markdown(
+                f'<div style="display: flex; gap: 16px;">{cards_html}</div>',
+                unsafe_allow_html=True
+            )
+        
+        # Save detections only when the detection was just run, not on redisplay
+        if detect_clicked:
+            rows = [
+                {
+                    'user_id': user_id,
+                    'species': species,
+                    'confidence_layer1': layer1_conf_map.get(species, det['confidence']),
+                    'confidence_layer2': det['confidence'],
+                    'snapshot_path': result['snapshot_path'],
+                    'verification_status': "verified",
+                    'source': "upload"
+                }
+                for species, det in detected_species.items()
+            ]
+            detection_ids = save_detections_bulk(rows)
             
-            if result['verified']:
-                # Display detected image
-                with col2:
-                    result_image = draw_boxes(image_bgr, result['layer2_detections'])
-                    result_image_rgb = cv2.cvtColor(result_image, cv2.COLOR_BGR2RGB)
-                    st.image(result_image_rgb, use_column_width=True)
-                
-                # Get all detected species
-                detected_species = {}
-                for det in result['layer2_detections']:
-                    species = det['class_name']
-                    if species not in detected_species or det['confidence'] > detected_species[species]['confidence']:
-                        detected_species[species] = det
+            alerted_ids = []
+            for row, detection_id in zip(rows, detection_ids):
+                # Send alert
+                alert_sent, alert_msg = send_alert_if_ready(
+                    species=row['species'],
+                    confidence_layer1=row['confidence_layer1'],
+                    confidence_layer2=row['confidence_layer2'],
+                    snapshot_path=row['snapshot_path'],
+                    user_id=user_id,
+                    location=config.DEFAULT_LOCATION,
+                    source="upload"
+                )
                 
-                st.markdown("<br>", unsafe_allow_html=True)
-                
-                # Success message
-                st.markdown(f"""
-                <div class="alert-success" style="
-                    background: rgba(16, 185, 129, 0.1);
-                    border: 1px solid var(--success);
-                    border-radius: var(--radius-lg);
-                    padding: 24px;
-                    margin: 20px 0;
-                    text-align: center;
-                ">
-                    <div style="font-size: 64px; margin-bottom: 16px;">🎉</div>
-                    <h2 style="
-                        font-size: 1.75rem; 
-                        font-weight: 800; 
-                        color: var(--success);
-                        margin-bottom: 8px;
-                    ">Detected {len(detected_species)} </h2>
-                    <p style="color: var(--text-secondary); font-size: 1rem;">
-                        2-layer verification completed successfully
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Display each detected animal in cards
-                cols = st.columns(len(detected_species))
-                for idx, (species, det) in enumerate(detected_species.items()):
-                    layer1_conf = next((d['confidence'] for d in result['layer1_detections'] if d['class_name'] == species), det['confidence'])
-                    
-                    with cols[idx]:
-                        st.markdown(f"""
-                        <div class="card" style="padding: 28px 24px; border-top: 4px solid var(--primary);">
-                            <div style="text-align: center; margin-bottom: 20px;">
-                                <div style="font-size: 72px; margin-bottom: 12px;">
-                                    {config.CLASS_EMOJIS.get(species, '🦁')}
-                                </div>
-                                <h3 style="
-                                    font-size: 1.5rem; 
-                                    font-weight: 800; 
-                                    color: var(--primary);
-                                    margin: 0;
-                                ">{species}</h3>
-                            </div>
-                            {create_confidence_bar(layer1_conf, "Layer 1")}
-                            {create_confidence_bar(det['confidence'], "Layer 2")}
-                        </div>
-                        """, unsafe_allow_html=True)
-                
-                # Save detections
-                saved_count = 0
-                for species, det in detected_species.items():
-                    layer1_conf = next((d['confidence'] for d in result['layer1_detections'] if d['class_name'] == species), det['confidence'])
-                    
-                    detection_id = save_detection(
-                        user_id=user_id,
-                        species=species,
-                        confidence_layer1=layer1_conf,
-                        confidence_layer2=det['confidence'],
-                        snapshot_path=result['snapshot_path'],
-                        verification_status="verified",
-                        source="upload"
-                    )
-                    
-                    if detection_id:
-                        saved_count += 1
-                        
-                        # Send alert
-                        alert_sent, alert_msg = send_alert_if_ready(
-                            species=species,
-                            confidence_layer1=layer1_conf,
-                            confidence_layer2=det['confidence'],
-                            snapshot_path=result['snapshot_path'],
-                            user_id=user_id,
-                            location=config.DEFAULT_LOCATION,
-                            source="upload"
-                        )
-                        
-                        if alert_sent:
-                            from database.detection_manager import update_detection_alert_status
-                            update_detection_alert_status(detection_id, alert_sent=True)
-                            st.success(f"📧 {alert_msg}")
-                        else:
-                            st.info(f"ℹ️ {alert_msg}")
-                
-                if saved_count > 0:
-                    st.success(f"✅ {saved_count} detection(s) saved to database")
+                if alert_sent:
+                    alerted_ids.append(detection_id)
+                    st.success(f"📧 {alert_msg}")
+                else:
+                    st.info(f"ℹ️ {alert_msg}")
             
-            else:
-                # Detection failed
-                with col2:
-                    st.markdown("""
-                    <div style="
-                        background: linear-gradient(135deg, rgba(99, 102, 241, 0.05) 0%, rgba(16, 185, 129, 0.05) 100%);
-                        border: 2px dashed var(--border-color);
-                        border-radius: var(--radius-lg);
-                        padding: 60px 30px;
-                        text-align: center;
-                    ">
-                        <div style="font-size: 80px; margin-bottom: 20px; opacity: 0.5;">🔍</div>
-                        <h3 style="
-                            font-size: 1.25rem; 
-                            font-weight: 700; 
-                            color: var(--text-secondary);
-                            margin-bottom: 10px;
-                        ">No detections</h3>
-                        <p style="color: var(--text-muted); font-size: 0.875rem;">
-                            Upload image to see results
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("<br>", unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="alert-warning">
-                    <h3 style="margin: 0 0 10px 0; color: var(--warning);">⚠️ No Wildlife Detected</h3>
-                    <p style="margin: 0; color: var(--text-secondary);">
-                        The 2-layer verification did not find any wildlife in this image.
-                    </p>
-                    {f'<p style="margin: 10px 0 0 0; font-size: 14px; color: var(--text-muted);">Reason: {result.get("rejection_reason", "Unknown")}</p>' if result.get('rejection_reason') else ''}
-                </div>
-                """, unsafe_allow_html=True)
-                
-                if result['layer1_detections']:
-                    st.info(f"ℹ️ Layer 1 found {len(result['layer1_detections'])} potential detection(s), but Layer 2 verification failed")
+            if alerted_ids:
+                update_detection_alert_status_bulk(alerted_ids)
+            
+            if detection_ids:
+                st.success(f"✅ {len(detection_ids)} detection(s) saved to database")
+    
+    else:
+        # Detection failed
+        with col2:
+            st.markdown(_NO_DETECTION_HTML, unsafe_allow_html=True)
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        reason_html = (
+            f'<p style="margin: 10px 0 0 0; font-size: 14px; color: var(--text-muted);">Reason: {result["rejection_reason"]}</p>'
+            if result.get('rejection_reason') else ''
+        )
+        st.markdown(_NO_WILDLIFE_TMPL.substitute(reason_html=reason_html), unsafe_allow_html=True)
+        
+        if result['layer1_detections']:
+            st.info(f"ℹ️ Layer 1 found {len(result['layer1_detections'])} potential detection(s), but Layer 2 verification failed")
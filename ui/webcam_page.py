@@ -4,18 +4,102 @@ Modern AdminLTE-inspired real-time detection interface
 """
 
 import streamlit as st
-import cv2
 import numpy as np
 from datetime import datetime
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from string import Template
 import config
 from utils.video_processor import WebcamProcessor
 from utils.verification import verify_detection_2layer, should_trigger_snapshot
+from utils.yolo_detector import get_best_detection_per_species
 from database.user_manager import get_current_user_id
-from database.detection_manager import save_detection
+from database.detection_manager import save_detection, update_detection_alert_status_bulk
 from alerts.email_service import send_alert_if_ready
 
 
+# Live view HTML, built once at import instead of on every tick
+_LIVE_STATS_HEADER_HTML = """
+<div class="card" style="padding: 20px; margin-bottom: 16px;">
+    <h4 style="
+        font-size: 1rem; 
+        font-weight: 700; 
+        color: var(--info);
+        margin: 0 0 16px 0;
+    ">📊 Live Stats</h4>
+</div>
+"""
+
+_STATS_TMPL = Template("""
+<div style="margin: 16px 0;">
+    <div class="card" style="
+        padding: 12px;
+        margin-bottom: 8px;
+        background: var(--bg-card);
+    ">
+        <div style="color: var(--text-muted); font-size: 0.7rem; margin-bottom: 4px; text-transform: uppercase;">FPS</div>
+        <div style="color: var(--info); font-size: 1.5rem; font-weight: 900;">$fps</div>
+    </div>
+    <div class="card" style="
+        padding: 12px;
+        background: var(--bg-card);
+    ">
+        <div style="color: var(--text-muted); font-size: 0.7rem; margin-bottom: 4px; text-transform: uppercase;">DETECTIONS</div>
+        <div style="color: var(--primary); font-size: 1.5rem; font-weight: 900;">$count</div>
+    </div>
+    <div class="card" style="
+        padding: 12px;
+        margin-top: 8px;
+        background: var(--bg-card);
+    ">
+        <div style="color: var(--text-muted); font-size: 0.7rem; margin-bottom: 4px; text-transform: uppercase;">DETECT EVERY</div>
+        <div style="color: var(--warning); font-size: 1.5rem; font-weight: 900;">$skip</div>
+    </div>
+</div>
+""")
+
+_ALERT_TMPL = Template("""
+<div class="alert-success" style="
+    background: rgba(16, 185, 129, 0.1);
+    border: 1px solid var(--success);
+    border-radius: var(--radius-md);
+    padding: 20px;
+    margin: 16px 0;
+">
+    <h3 style="
+        font-size: 1.25rem; 
+        font-weight: 800; 
+        color: var(--success);
+        margin: 0 0 12px 0;
+    ">✅ $count Animal(s) Detected!</h3>
+</div>
+""")
+
+_SPECIES_CARD_TMPL = Template("""
+<div class="card" style="
+    background: rgba(14, 165, 233, 0.1);
+    padding: 12px;
+    text-align: center;
+    border: 1px solid var(--info);
+">
+    <div style="font-size: 2rem; margin-bottom: 6px;">
+        $emoji
+    </div>
+    <div style="
+        font-weight: 700;
+        color: var(--info);
+        font-size: 0.875rem;
+    ">$species</div>
+    <div style="
+        color: var(--text-secondary);
+        font-size: 0.75rem;
+    ">$confidence</div>
+</div>
+""")
+
+
 def show_webcam_page():
     """Display modern webcam streaming page with AdminLTE-inspired design."""
     
@@ -123,8 +207,21 @@ def show_webcam_page():
     with col_c1:
         if st.button("▶️ Start", use_container_width=True, type="primary", 
                     disabled=st.session_state.get('webcam_running', False)):
-            if st.session_state['webcam_processor'].start():
+            processor = st.session_state['webcam_processor']
+            
+            # Verification runs on background threads, so its cooldown and
+            # latest alert live in a plain dict instead of session_state
+            verify_state = _new_verify_state()
+            processor.on_result = partial(_on_webcam_result, processor, user_id, verify_state)
+            
+            # The first start may export the fast model, which takes a while
+            with st.spinner("⚙️ Preparing detection model..."):
+                started = processor.start()
+            if started:
                 st.session_state['webcam_running'] = True
+                st.session_state['webcam_frame_counter'] = 0
+                st.session_state['webcam_detection_count'] = 0
+                st.session_state['webcam_verify_state'] = verify_state
                 st.success("✅ Webcam started!")
                 st.rerun()
             else:
@@ -150,195 +247,33 @@ def show_webcam_page():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    if st.session_state.pop('webcam_read_failed', False):
+        st.error("❌ Failed to read frame from webcam")
+    
     # === WEBCAM DISPLAY ===
     if st.session_state.get('webcam_running', False):
-        # Create placeholders
+        processor = st.session_state['webcam_processor']
+        verify_state = st.session_state['webcam_verify_state']
+        
         video_col, stats_col = st.columns([3, 1])
         
+        # Only the fragments below rerun on their timers; this block stays put
         with video_col:
             video_placeholder = st.empty()
         
         with stats_col:
-            st.markdown("""
-            <div class="card" style="padding: 20px; margin-bottom: 16px;">
-                <h4 style="
-                    font-size: 1rem; 
-                    font-weight: 700; 
-                    color: var(--info);
-                    margin: 0 0 16px 0;
-                ">📊 Live Stats</h4>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_LIVE_STATS_HEADER_HTML, unsafe_allow_html=True)
             stats_placeholder = st.empty()
-            detection_placeholder = st.empty()
         
         alert_placeholder = st.empty()
         
-        processor = st.session_state['webcam_processor']
-        frame_skip_counter = 0
-        
-        # Initialize snapshot cooldown
-        if 'last_snapshot_time' not in st.session_state:
-            st.session_state['last_snapshot_time'] = 0
+        # Placeholders are fresh on a full rerun, so force the first draw
+        st.session_state['webcam_stats_shown'] = None
+        st.session_state['webcam_alert_shown'] = None
         
-        SNAPSHOT_COOLDOWN = 5
-        
-        # === VIDEO LOOP ===
-        while processor.is_running():
-            success, frame = processor.read_frame()
-            
-            if not success:
-                st.error("❌ Failed to read frame from webcam")
-                break
-            
-            frame_skip_counter += 1
-            should_process = frame_skip_counter % config.PROCESS_EVERY_N_FRAMES == 0
-            
-            if enable_detection and should_process:
-                processed_frame, detections = processor.process_frame(
-                    frame,
-                    enable_detection=True,
-                    conf_threshold=config.LAYER1_CONFIDENCE
-                )
-                
-                # Check for auto-snapshot
-                if detections and should_trigger_snapshot(detections):
-                    current_time = time.time()
-                    time_since_last = current_time - st.session_state['last_snapshot_time']
-                    is_ip_webcam = isinstance(processor.camera_index, str)
-                    can_snapshot = not is_ip_webcam or time_since_last >= SNAPSHOT_COOLDOWN
-                    
-                    if can_snapshot:
-                        st.session_state['last_snapshot_time'] = current_time
-                        
-                        with stats_col:
-                            st.info("🔍 Verifying...")
-                        
-                        result = verify_detection_2layer(frame)
-                        
-                        if result['verified']:
-                            # Get all detected species
-                            detected_species = {}
-                            for det in result['layer2_detections']:
-                                species = det['class_name']
-                                if species not in detected_species or det['confidence'] > detected_species[species]['confidence']:
-                                    detected_species[species] = det
-                            
-                            # Display alert
-                            with alert_placeholder:
-                                st.markdown(f"""
-                                <div class="alert-success" style="
-                                    background: rgba(16, 185, 129, 0.1);
-                                    border: 1px solid var(--success);
-                                    border-radius: var(--radius-md);
-                                    padding: 20px;
-                                    margin: 16px 0;
-                                ">
-                                    <h3 style="
-                                        font-size: 1.25rem; 
-                                        font-weight: 800; 
-                                        color: var(--success);
-                                        margin: 0 0 12px 0;
-                                    ">✅ {len(detected_species)} Animal(s) Detected!</h3>
-                                </div>
-                                """, unsafe_allow_html=True)
-                                
-                                cols = st.columns(min(len(detected_species), 4))
-                                for idx, (species, det) in enumerate(detected_species.items()):
-                                    with cols[idx % 4]:
-                                        st.markdown(f"""
-                                        <div class="card" style="
-                                            background: rgba(14, 165, 233, 0.1);
-                                            padding: 12px;
-                                            text-align: center;
-                                            border: 1px solid var(--info);
-                                        ">
-                                            <div style="font-size: 2rem; margin-bottom: 6px;">
-                                                {config.CLASS_EMOJIS.get(species, '')}
-                                            </div>
-                                            <div style="
-                                                font-weight: 700;
-                                                color: var(--info);
-                                                font-size: 0.875rem;
-                                            ">{species}</div>
-                                            <div style="
-                                                color: var(--text-secondary);
-                                                font-size: 0.75rem;
-                                            ">{det['confidence']:.0%}</div>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-                            
-                            # Save detections
-                            saved_count = 0
-                            for species, det in detected_species.items():
-                                layer1_conf = next((d['confidence'] for d in result['layer1_detections'] if d['class_name'] == species), det['confidence'])
-                                
-                                detection_id = save_detection(
-                                    user_id=user_id,
-                                    species=species,
-                                    confidence_layer1=layer1_conf,
-                                    confidence_layer2=det['confidence'],
-                                    snapshot_path=result['snapshot_path'],
-                                    verification_status="verified",
-                                    source="webcam"
-                                )
-                                
-                                if detection_id:
-                                    saved_count += 1
-                                    alert_sent, alert_msg = send_alert_if_ready(
-                                        species=species,
-                                        confidence_layer1=layer1_conf,
-                                        confidence_layer2=det['confidence'],
-                                        snapshot_path=result['snapshot_path'],
-                                        user_id=user_id,
-                                        location=config.DEFAULT_LOCATION,
-                                        source="webcam"
-                                    )
-                                    
-                                    if alert_sent:
-                                        from database.detection_manager import update_detection_alert_status
-                                        update_detection_alert_status(detection_id, alert_sent=True)
-                            
-                            if saved_count > 0:
-                                with alert_placeholder:
-                                    st.success(f"💾 {saved_count} detection(s) saved! Check Dashboard.")
-            else:
-                processed_frame = frame.copy()
-                detections = []
-            
-            # Display frame
-            display_frame = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-            with video_col:
-                video_placeholder.image(display_frame, channels="RGB", use_column_width=True)
-            
-            # Show stats
-            with stats_col:
-                with stats_placeholder:
-                    fps = processor.get_fps()
-                    st.markdown(f"""
-                    <div style="margin: 16px 0;">
-                        <div class="card" style="
-                            padding: 12px;
-                            margin-bottom: 8px;
-                            background: var(--bg-card);
-                        ">
-                            <div style="color: var(--text-muted); font-size: 0.7rem; margin-bottom: 4px; text-transform: uppercase;">FPS</div>
-                            <div style="color: var(--info); font-size: 1.5rem; font-weight: 900;">{fps:.1f}</div>
-                        </div>
-                        <div class="card" style="
-                            padding: 12px;
-                            background: var(--bg-card);
-                        ">
-                            <div style="color: var(--text-muted); font-size: 0.7rem; margin-bottom: 4px; text-transform: uppercase;">DETECTIONS</div>
-                            <div style="color: var(--primary); font-size: 1.5rem; font-weight: 900;">{len(detections)}</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            time.sleep(0.01)
-            
-            if not st.session_state.get('webcam_running', False):
-                break
+        _video_fragment(processor, enable_detection, video_placeholder)
+        _stats_fragment(processor, stats_placeholder)
+        _alert_fragment(verify_state, alert_placeholder)
     
     else:
         # Empty state - show instructions
@@ -444,3 +379,248 @@ def show_webcam_page():
                 </div>
             </div>
             """, unsafe_allow_html=True)
+
+
+SNAPSHOT_COOLDOWN = 5
+
+# Webcam verification (full-model pass, snapshot, DB writes) runs here,
+# one result at a time, never on the inference or Streamlit threads
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webcam-verify")
+
+
+@st.fragment(run_every=1 / 30)
+def _video_fragment(processor, enable_detection, placeholder):
+    """
+    Render one live video tick.
+    
+    Takes the newest frame if there is one, shows the latest annotated
+    result and hands the frame to the inference worker (or back to the
+    capture pool). Never waits for the camera or for verification, which
+    runs on the worker's on_result hook; a tick without a new frame leaves
+    the placeholder as it is.
+    
+    Args:
+        processor (WebcamProcessor): Running webcam processor
+        enable_detection (bool): Whether to run detection
+        placeholder: st.empty() slot in the video column
+    """
+    success, frame = processor.read_frame(timeout=0)
+    
+    if not success:
+        # Still running means no new frame yet; try next tick
+        if processor.is_running():
+            return
+        
+        # The stream died: stop it and rerun the whole page out of live mode
+        processor.stop()
+        st.session_state['webcam_running'] = False
+        st.session_state['webcam_read_failed'] = True
+        st.rerun()
+    
+    state = st.session_state
+    state['webcam_frame_counter'] = state.get('webcam_frame_counter', 0) + 1
+    frame_skip = processor.update_frame_skip()
+    should_process = state['webcam_frame_counter'] % frame_skip == 0
+    
+    display_source = frame
+    detection_count = 0
+    
+    if enable_detection:
+        latest = processor.latest_result()
+        if latest is not None:
+            _, annotated_frame, detections = latest
+            display_source = annotated_frame
+            detection_count = len(detections)
+    
+    state['webcam_detection_count'] = detection_count
+    
+    # Display frame (channel-reversed view, no copy); encoded before returning
+    placeholder.image(display_source[..., ::-1], channels="RGB", use_column_width=True)
+    
+    if enable_detection and should_process:
+        # Hand the frame to the inference worker; never blocks the tick
+        processor.submit_frame(frame, conf_threshold=config.LAYER1_CONFIDENCE)
+    else:
+        processor.release_frame(frame)
+
+
+def _new_verify_state():
+    """
+    Create the verification state shared by the webcam's background threads.
+    
+    Returns:
+        dict: Lock, in-flight flag, snapshot cooldown and latest alert
+    """
+    return {
+        'lock': threading.Lock(),
+        'busy': False,
+        'last_snapshot_time': 0.0,
+        'last_alert': None
+    }
+
+
+def _on_webcam_result(processor, user_id, verify_state, frame, detections):
+    """
+    Queue 2-layer verification for a new detection result.
+    
+    Runs on the processor's inference thread, so it only checks the trigger
+    and cooldown; a result arriving while a verification is still running
+    is skipped.
+    
+    Args:
+        processor (WebcamProcessor): Running webcam processor
+        user_id (ObjectId): Current user ID
+        verify_state (dict): State from _new_verify_state
+        frame (np.ndarray): Frame the detections were computed on (BGR)
+        detections (list): Layer 1 detections for frame
+    """
+    if not detections or not should_trigger_snapshot(detections):
+        return
+    
+    current_time = time.time()
+    with verify_state['lock']:
+        if verify_state['busy']:
+            return
+        
+        time_since_last = current_time - verify_state['last_snapshot_time']
+        if processor.is_ip_webcam and time_since_last < SNAPSHOT_COOLDOWN:
+            return
+        
+        verify_state['busy'] = True
+        verify_state['last_snapshot_time'] = current_time
+    
+    # The processor recycles frame once this returns, so verify a copy
+    _VERIFY_POOL.submit(_verify_and_save, frame.copy(), detections, user_id, verify_state)
+
+
+def _verify_and_save(frame, detections, user_id, verify_state):
+    """
+    Run 2-layer verification on a detection result and save confirmed species.
+    
+    Args:
+        frame (np.ndarray): Frame the detections were computed on (BGR)
+        detections (list): Layer 1 detections for frame
+        user_id (ObjectId): Current user ID
+        verify_state (dict): State from _new_verify_state
+    """
+    try:
+        # Layer 1 already ran on this frame at LAYER1_CONFIDENCE
+        result = verify_detection_2layer(frame, layer1_detections=detections)
+        
+        if not result['verified']:
+            return
+        
+        # Best detection per species, for Layer 2 (cards) and Layer 1 (saved confidence)
+        detected_species = get_best_detection_per_species(result['layer2_detections'])
+        layer1_best = get_best_detection_per_species(result['layer1_detections'])
+        
+        # Save detections
+        saved_count = 0
+        alerted_ids = []
+        for species, det in detected_species.items():
+            layer1_conf = layer1_best[species]['confidence'] if species in layer1_best else det['confidence']
+            
+            detection_id = save_detection(
+                user_id=user_id,
+                species=species,
+                confidence_layer1=layer1_conf,
+                confidence_layer2=det['confidence'],
+                snapshot_path=result['snapshot_path'],
+                verification_status="verified",
+                source="webcam"
+            )
+            
+            if detection_id:
+                saved_count += 1
+                alert_sent, alert_msg = send_alert_if_ready(
+                    species=species,
+                    confidence_layer1=layer1_conf,
+                    confidence_layer2=det['confidence'],
+                    snapshot_path=result['snapshot_path'],
+                    user_id=user_id,
+                    location=config.DEFAULT_LOCATION,
+                    source="webcam"
+                )
+                
+                if alert_sent:
+                    alerted_ids.append(detection_id)
+        
+        if alerted_ids:
+            update_detection_alert_status_bulk(alerted_ids)
+        
+        # Shown by _alert_fragment until the next verified detection
+        verify_state['last_alert'] = {
+            'species': detected_species,
+            'saved_count': saved_count
+        }
+    
+    except Exception as e:
+        print(f"Error verifying webcam detection: {e}")
+    
+    finally:
+        with verify_state['lock']:
+            verify_state['busy'] = False
+
+
+@st.fragment(run_every=0.5)
+def _stats_fragment(processor, placeholder):
+    """
+    Refresh the live stats cards, only when a displayed value changed.
+    
+    Args:
+        processor (WebcamProcessor): Running webcam processor
+        placeholder: st.empty() slot in the stats column
+    """
+    stats = (
+        round(processor.get_fps(), 1),
+        st.session_state.get('webcam_detection_count', 0),
+        processor.frame_skip
+    )
+    if stats == st.session_state.get('webcam_stats_shown'):
+        return
+    
+    st.session_state['webcam_stats_shown'] = stats
+    fps, detection_count, frame_skip = stats
+    placeholder.markdown(
+        _STATS_TMPL.substitute(
+            fps=f"{fps:.1f}",
+            count=detection_count,
+            skip=f"{frame_skip} frame{'s' if frame_skip > 1 else ''}"
+        ),
+        unsafe_allow_html=True
+    )
+
+
+@st.fragment(run_every=1.0)
+def _alert_fragment(verify_state, placeholder):
+    """
+    Show the most recent verified detection alert once it changes.
+    
+    Args:
+        verify_state (dict): State from _new_verify_state
+        placeholder: st.empty() slot below the video
+    """
+    alert = verify_state['last_alert']
+    if not alert or alert is st.session_state.get('webcam_alert_shown'):
+        return
+    
+    st.session_state['webcam_alert_shown'] = alert
+    detected_species = alert['species']
+    
+    with placeholder.container():
+        st.markdown(_ALERT_TMPL.substitute(count=len(detected_species)), unsafe_allow_html=True)
+        
+        cols = st.columns(min(len(detected_species), 4))
+        for idx, (species, det) in enumerate(detected_species.items()):
+            with cols[idx % 4]:
+                st.markdown(
+                    _SPECIES_CARD_TMPL.substitute(
+                        emoji=config.CLASS_EMOJIS.get(species, ''),
+                        species=species,
+                        confidence=f"{det['confidence']:.0%}"
+                    ),
+                    unsafe_allow_html=True
+                )
+        
+        if alert['saved_count'] > 0:
+            st.success(f"💾 {alert['saved_count']} detection(s) saved! Check Dashboard.")
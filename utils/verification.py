@@ -5,16 +5,61 @@ Implements dual-layer YOLO verification to reduce false positives
 
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+import threading
 import config
-from utils.yolo_detector import detect_objects, get_highest_confidence_detection
+from utils.yolo_detector import detect_objects_raw, get_highest_confidence_detection
+
+
+# Single background writer so disk latency never blocks detection
+_IO_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-writer")
+_pending_writes = {}
+_pending_lock = threading.Lock()
+
+
+def _write_snapshot(filepath, data):
+    """Write encoded snapshot bytes to disk (runs on the writer thread)."""
+    try:
+        Path(filepath).write_bytes(data)
+    except Exception as e:
+        print(f"Error writing snapshot: {e}")
+    finally:
+        with _pending_lock:
+            _pending_writes.pop(filepath, None)
+
+
+def wait_for_snapshot(filepath, timeout=5.0):
+    """
+    Block until a queued snapshot write has finished.
+    
+    Args:
+        filepath (str): Path returned by save_snapshot
+        timeout (float): Maximum seconds to wait
+        
+    Returns:
+        bool: True if the file is on disk
+    """
+    with _pending_lock:
+        future = _pending_writes.get(filepath)
+    
+    if future is not None:
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            pass
+    
+    return Path(filepath).exists()
 
 
 def save_snapshot(image, detection, source="webcam"):
     """
     Save snapshot with timestamp and detection information.
     
+    The JPEG is encoded on the calling thread and written to disk in the
+    background; use wait_for_snapshot() before reading the file back.
+    
     Args:
         image (np.ndarray): Image to save
         detection (dict): Detection information
@@ -32,10 +77,16 @@ def save_snapshot(image, detection, source="webcam"):
         filename = f"{timestamp}_{species}_{confidence}_{source}.jpg"
         filepath = config.SNAPSHOT_DIR / filename
         
-        # Save image
-        cv2.imwrite(str(filepath), image)
+        # Encode now, write in the background
+        ok, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), config.VIDEO_QUALITY])
+        if not ok:
+            return None
         
-        return str(filepath)
+        filepath = str(filepath)
+        with _pending_lock:
+            _pending_writes[filepath] = _IO_POOL.submit(_write_snapshot, filepath, buffer.tobytes())
+        
+        return filepath
     
     except Exception as e:
         print(f"Error saving snapshot: {e}")
@@ -64,31 +115,40 @@ def delete_snapshot(filepath):
         return False
 
 
-def verify_detection_2layer(image):
+def check_detection_2layer(image, layer1_detections=None):
     """
-    Perform 2-layer verification on an image.
+    Run the 2-layer detection check on an image without saving anything.
     
     Workflow:
-    1. Layer 1: Run detection with LAYER1_CONFIDENCE threshold
-    2. If detection found, capture snapshot
-    3. Layer 2: Re-run detection on snapshot with LAYER2_CONFIDENCE threshold
-    4. If Layer 2 confirms, return verified detection
-    5. If Layer 2 fails, delete snapshot and return None
+    1. Layer 1: Use the caller's detections, or filter one full-model pass
+       at LAYER1_CONFIDENCE
+    2. Layer 2: Filter the full-model pass at LAYER2_CONFIDENCE (running it
+       now if Layer 1 came from the caller, e.g. the webcam's fast model)
+       and require the same top species as Layer 1
+    3. Return the verified detection, or a rejection reason
     
     Args:
         image (np.ndarray): Input image (BGR format)
+        layer1_detections (list, optional): Detections already computed on
+            this image at LAYER1_CONFIDENCE; used instead of filtering the
+            raw pass (which then only runs if they are non-empty)
         
     Returns:
         dict or None: Verification result containing:
             - layer1_detections: List of Layer 1 detections
             - layer2_detections: List of Layer 2 detections
             - verified: Boolean indicating if verification passed
-            - snapshot_path: Path to snapshot (if verified)
+            - snapshot_path: Always None (see save_verified_snapshot)
             - best_detection: Highest confidence detection (if verified)
     """
     
+    # One forward pass serves both layers; thresholds are post-filters
+    raw_detections = None
+    
     # === LAYER 1: Initial Detection ===
-    layer1_detections = detect_objects(image, conf_threshold=config.LAYER1_CONFIDENCE)
+    if layer1_detections is None:
+        raw_detections = detect_objects_raw(image)
+        layer1_detections = [d for d in raw_detections if d['confidence'] >= config.LAYER1_CONFIDENCE]
     
     if not layer1_detections:
         return {
@@ -103,40 +163,14 @@ def verify_detection_2layer(image):
     # Get highest confidence detection from Layer 1
     best_layer1 = get_highest_confidence_detection(layer1_detections)
     
-    # === SNAPSHOT CAPTURE ===
-    snapshot_path = save_snapshot(image, best_layer1, source="verification")
-    
-    if not snapshot_path:
-        return {
-            'layer1_detections': layer1_detections,
-            'layer2_detections': [],
-            'verified': False,
-            'snapshot_path': None,
-            'best_detection': None,
-            'rejection_reason': 'Snapshot save failed'
-        }
-    
-    # === LAYER 2: Verification Re-Detection ===
-    # Read the saved snapshot for verification
-    snapshot_image = cv2.imread(snapshot_path)
-    
-    if snapshot_image is None:
-        delete_snapshot(snapshot_path)
-        return {
-            'layer1_detections': layer1_detections,
-            'layer2_detections': [],
-            'verified': False,
-            'snapshot_path': None,
-            'best_detection': None,
-            'rejection_reason': 'Snapshot read failed'
-        }
+    # === LAYER 2: Verification ===
+    if raw_detections is None:
+        # Layer 1 came from another pass, so the full model confirms it here
+        raw_detections = detect_objects_raw(image)
     
-    layer2_detections = detect_objects(snapshot_image, conf_threshold=config.LAYER2_CONFIDENCE)
+    layer2_detections = [d for d in raw_detections if d['confidence'] >= config.LAYER2_CONFIDENCE]
     
-    # === VERIFICATION CHECK ===
     if not layer2_detections:
-        # Layer 2 failed - delete snapshot
-        delete_snapshot(snapshot_path)
         return {
             'layer1_detections': layer1_detections,
             'layer2_detections': [],
@@ -150,8 +184,7 @@ def verify_detection_2layer(image):
     best_layer2 = get_highest_confidence_detection(layer2_detections)
     
     if best_layer1['class_name'] != best_layer2['class_name']:
-        # Different species detected - delete snapshot
-        delete_snapshot(snapshot_path)
+        # Different species detected
         return {
             'layer1_detections': layer1_detections,
             'layer2_detections': layer2_detections,
@@ -166,7 +199,7 @@ def verify_detection_2layer(image):
         'layer1_detections': layer1_detections,
         'layer2_detections': layer2_detections,
         'verified': True,
-        'snapshot_path': snapshot_path,
+        'snapshot_path': None,
         'best_detection': {
             'species': best_layer2['class_name'],
             'confidence_layer1': best_layer1['confidence'],
@@ -178,6 +211,54 @@ def verify_detection_2layer(image):
     }
 
 
+def save_verified_snapshot(image, result):
+    """
+    Save the snapshot for a passed check_detection_2layer() result.
+    
+    Args:
+        image (np.ndarray): Image the check ran on (BGR format)
+        result (dict): Result of check_detection_2layer
+        
+    Returns:
+        dict: New result with snapshot_path set, or a rejection if the
+            check failed or the snapshot could not be saved
+    """
+    if not result['verified']:
+        return result
+    
+    # Only verified frames are written to disk
+    best = result['best_detection']
+    snapshot_path = save_snapshot(
+        image,
+        {'class_name': best['species'], 'confidence': best['confidence_layer1']},
+        source="verification"
+    )
+    
+    if not snapshot_path:
+        return {
+            **result,
+            'verified': False,
+            'best_detection': None,
+            'rejection_reason': 'Snapshot save failed'
+        }
+    
+    return {**result, 'snapshot_path': snapshot_path}
+
+
+def verify_detection_2layer(image, layer1_detections=None):
+    """
+    Perform 2-layer verification and save a snapshot if it passes.
+    
+    Args:
+        image (np.ndarray): Input image (BGR format)
+        layer1_detections (list, optional): See check_detection_2layer
+        
+    Returns:
+        dict: Verification result, with snapshot_path set if verified
+    """
+    return save_verified_snapshot(image, check_detection_2layer(image, layer1_detections))
+
+
 def should_trigger_snapshot(detections):
     """
     Check if any detection exceeds the auto-snapshot threshold.
@@ -188,8 +269,5 @@ def should_trigger_snapshot(detections):
     Returns:
         bool: True if snapshot should be triggered
     """
-    if not detections:
-        return False
-    
-    best = get_highest_confidence_detection(detections)
-    return best['confidence'] >= config.AUTO_SNAPSHOT_THRESHOLD
+    threshold = config.AUTO_SNAPSHOT_THRESHOLD
+    return any(d['confidence'] >= threshold for d in detections)
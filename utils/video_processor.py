@@ -3,12 +3,32 @@ Video Processor
 Handles webcam capture and frame processing for real-time detection
 """
 
+import os
+import re
+import math
 import cv2
-import numpy as np
-from datetime import datetime
+import threading
 import time
+from collections import deque
 import config
-from utils.yolo_detector import load_model, detect_objects, draw_boxes
+from utils.yolo_detector import load_fast_model, detect_objects, draw_boxes_fast
+
+
+# GStreamer support depends on how OpenCV was built
+_HAS_GSTREAMER = re.search(r'GStreamer:\s*YES', cv2.getBuildInformation()) is not None
+
+# Low-latency FFmpeg options, applied only while an IP stream is opened
+_FFMPEG_OPTIONS_VAR = 'OPENCV_FFMPEG_CAPTURE_OPTIONS'
+_FFMPEG_LOW_LATENCY_OPTIONS = 'rtsp_transport;udp|fflags;nobuffer|flags;low_delay'
+_FFMPEG_ENV_LOCK = threading.Lock()
+
+# Per-frame constants resolved once at import
+_WEBCAM_SIZE = (config.WEBCAM_WIDTH, config.WEBCAM_HEIGHT)
+_INFERENCE_SIZE = config.INFERENCE_SIZE
+_LABEL_MIN_FPS = config.LABEL_MIN_FPS
+
+# Free capture buffers kept for reuse once their last owner is done
+_CAPTURE_POOL_SIZE = 4
 
 
 class WebcamProcessor:
@@ -22,52 +42,330 @@ class WebcamProcessor:
             camera_index: Camera index (0 for default) or IP webcam URL string
         """
         self.camera_index = camera_index
+        self.is_ip_webcam = isinstance(camera_index, str)
         self.cap = None
         self.running = False
-        self.fps = 0
-        self.last_time = time.time()
-        self.frame_count = 0
         
-        # Load YOLO model
-        self.model = load_model()
+        # Monotonic timestamps of the last 30 frames served, for FPS
+        self._frame_times = deque(maxlen=30)
+        
+        # Single-slot "latest frame" filled by the capture thread
+        self._latest = None
+        self._read_failed = False
+        self._frame_ready = threading.Condition()
+        self._thread = None
+        self._free_buffers = []
+        self._buffer_shape = None
+        
+        # Inference worker: newest submitted frame in, newest result out
+        self._pending = None
+        self._result = None
+        self._result_id = 0
+        self._infer_ready = threading.Condition()
+        self._infer_thread = None
+        
+        # Optional on_result(frame, detections) hook, called on the worker
+        # thread after each detection so slow follow-up work stays off the UI.
+        # frame may be recycled once it returns; copy it to keep it
+        self.on_result = None
+        
+        # Adaptive frame skipping driven by smoothed inference time
+        self.process_ms_ema = 0.0
+        self.frame_skip = config.PROCESS_EVERY_N_FRAMES
+        
+        # Per-frame detection model (shared via st.cache_resource); it may
+        # need a one-off export, so it is loaded on start()
+        self.fast_model = None
+    
+    @staticmethod
+    def _open_ip_capture(url):
+        """
+        Open an IP webcam stream with the lowest-latency available backend.
+        
+        HTTP MJPEG streams (e.g. the IP Webcam phone app) go through a
+        GStreamer appsink that keeps only the newest decoded frame, if
+        OpenCV was built with GStreamer. Otherwise, or if the pipeline
+        fails to open, FFmpeg is used with its buffering turned down.
+        
+        Args:
+            url (str): Stream URL
+            
+        Returns:
+            cv2.VideoCapture: Capture object (may not be opened)
+        """
+        if url.startswith(('http://', 'https://')) and _HAS_GSTREAMER:
+            pipeline = (
+                f'souphttpsrc location="{url}" is-live=true do-timestamp=true '
+                '! multipartdemux ! jpegdec ! videoconvert ! video/x-raw,format=BGR '
+                '! appsink drop=true max-buffers=1 sync=false'
+            )
+            cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            if cap.isOpened():
+                return cap
+            cap.release()
+        
+        # Ask FFmpeg not to buffer stream frames; OpenCV reads the options
+        # from the environment on open, so set them only for this call
+        with _FFMPEG_ENV_LOCK:
+            previous = os.environ.get(_FFMPEG_OPTIONS_VAR)
+            os.environ[_FFMPEG_OPTIONS_VAR] = _FFMPEG_LOW_LATENCY_OPTIONS
+            try:
+                return cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+            finally:
+                if previous is None:
+                    os.environ.pop(_FFMPEG_OPTIONS_VAR, None)
+                else:
+                    os.environ[_FFMPEG_OPTIONS_VAR] = previous
     
     def start(self):
         """Start webcam capture."""
+        if self.fast_model is None:
+            self.fast_model = load_fast_model()
+        
         try:
             # Open camera (supports both index and URL)
-            self.cap = cv2.VideoCapture(self.camera_index)
+            if self.is_ip_webcam:
+                self.cap = self._open_ip_capture(self.camera_index)
+            else:
+                self.cap = cv2.VideoCapture(self.camera_index)
             
             if not self.cap.isOpened():
                 return False
             
             # Set resolution if using camera index (not URL)
-            if isinstance(self.camera_index, int):
+            if not self.is_ip_webcam:
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.WEBCAM_WIDTH)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.WEBCAM_HEIGHT)
                 self.cap.set(cv2.CAP_PROP_FPS, config.WEBCAM_FPS)
+                # Keep only the newest frame so reads are never stale
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             self.running = True
-            self.last_time = time.time()
+            self._frame_times.clear()
+            self._latest = None
+            self._read_failed = False
+            self._free_buffers = []
+            
+            # Drain the camera at its own rate on a background thread
+            self._thread = threading.Thread(target=self._reader, daemon=True)
+            self._thread.start()
+            
+            # Run detection off the render loop; stale frames are dropped
+            self._pending = None
+            self._result = None
+            self._infer_thread = threading.Thread(target=self._inference_worker, daemon=True)
+            self._infer_thread.start()
             return True
             
         except Exception as e:
             print(f"Error starting webcam: {e}")
             return False
     
+    def _acquire_buffer(self):
+        """
+        Take a buffer from the free list for the next capture.
+        
+        Returns:
+            np.ndarray or None: Free buffer, or None if the list is empty
+        """
+        with self._frame_ready:
+            return self._free_buffers.pop() if self._free_buffers else None
+    
+    def _release_buffer(self, buf):
+        """
+        Return a frame buffer that nothing else holds to the free list.
+        
+        Only the current owner of a frame may release it: the reader for
+        frames nobody took, the caller of read_frame() for frames it did not
+        submit, and the inference worker for submitted frames. Buffers that
+        do not match the current capture size are left to the GC.
+        
+        Args:
+            buf (np.ndarray): Buffer to recycle
+        """
+        with self._frame_ready:
+            if buf.shape == self._buffer_shape and len(self._free_buffers) < _CAPTURE_POOL_SIZE:
+                self._free_buffers.append(buf)
+    
+    def release_frame(self, frame):
+        """
+        Hand a frame from read_frame() back for reuse by the capture thread.
+        
+        Call this for frames that were not passed to submit_frame(), once
+        nothing reads them any more.
+        
+        Args:
+            frame (np.ndarray): Frame returned by read_frame()
+        """
+        self._release_buffer(frame)
+    
+    def _reader(self):
+        """
+        Capture thread: keep only the most recent frame in the slot.
+        
+        The thread owns the capture it was started with and releases it on
+        exit, so a read still blocked when stop() gives up waiting never
+        runs on a released capture.
+        """
+        cap = self.cap
+        try:
+            while self.running:
+                # Decode into a recycled buffer instead of allocating per frame
+                buf = self._acquire_buffer()
+                if buf is not None:
+                    success, frame = cap.read(buf)
+                else:
+                    success, frame = cap.read()
+                
+                with self._frame_ready:
+                    if not success:
+                        self._read_failed = True
+                        self._frame_ready.notify_all()
+                        return
+                    
+                    # OpenCV allocated a new frame: if the stream size
+                    # changed, the pooled buffers no longer fit
+                    if frame is not buf and frame.shape != self._buffer_shape:
+                        self._free_buffers.clear()
+                        self._buffer_shape = frame.shape
+                    
+                    dropped = self._latest
+                    self._latest = frame
+                    self._frame_ready.notify_all()
+                
+                # A frame replaced before anyone took it was never shared
+                if dropped is not None:
+                    self._release_buffer(dropped)
+        finally:
+            cap.release()
+    
+    def _inference_worker(self):
+        """Inference thread: detect on the newest submitted frame only."""
+        while self.running:
+            with self._infer_ready:
+                self._infer_ready.wait_for(lambda: self._pending is not None or not self.running)
+                if not self.running:
+                    return
+                frame, conf_threshold = self._pending
+                self._pending = None
+            
+            t0 = time.perf_counter()
+            processed_frame, detections = self.process_frame(frame, conf_threshold=conf_threshold)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            
+            with self._infer_ready:
+                if self.process_ms_ema == 0.0:
+                    self.process_ms_ema = elapsed_ms
+                else:
+                    self.process_ms_ema = 0.8 * self.process_ms_ema + 0.2 * elapsed_ms
+                self._result_id += 1
+                self._result = (self._result_id, processed_frame, detections)
+            
+            on_result = self.on_result
+            if on_result is not None:
+                try:
+                    on_result(frame, detections)
+                except Exception as e:
+                    print(f"Error handling detection result: {e}")
+            
+            # Boxes were drawn on a copy, so nothing reads the frame any more;
+            # without detections the result shows the frame itself
+            if processed_frame is not frame:
+                self._release_buffer(frame)
+    
+    def submit_frame(self, frame, conf_threshold=0.5):
+        """
+        Queue a frame for detection without blocking.
+        
+        If the worker is still busy, a previously queued frame that has not
+        started yet is replaced, so inference never falls behind the camera.
+        The processor owns the frame from here on; the caller must not
+        release or reuse it.
+        
+        Args:
+            frame: Input frame (BGR)
+            conf_threshold: Confidence threshold for detection
+        """
+        with self._infer_ready:
+            replaced = self._pending
+            self._pending = (frame, conf_threshold)
+            self._infer_ready.notify()
+        
+        # A replaced frame never reached the worker
+        if replaced is not None:
+            self._release_buffer(replaced[0])
+    
+    def update_frame_skip(self):
+        """
+        Adapt how often frames are sent for detection to the inference cost.
+        
+        The skip rises as soon as inference takes longer than the frames it
+        covers, and only drops once inference would fit into the lower level
+        with 20% headroom, so it does not oscillate around a boundary.
+        
+        Returns:
+            int: Process every Nth frame
+        """
+        fps = self.get_fps() or config.WEBCAM_FPS
+        frame_interval_ms = 1000.0 / fps
+        
+        with self._infer_ready:
+            ema_ms = self.process_ms_ema
+        
+        target_skip = max(config.PROCESS_EVERY_N_FRAMES, math.ceil(ema_ms / frame_interval_ms))
+        target_skip = min(target_skip, config.MAX_FRAME_SKIP)
+        
+        if target_skip > self.frame_skip:
+            self.frame_skip = target_skip
+        elif target_skip < self.frame_skip and ema_ms < 0.8 * (self.frame_skip - 1) * frame_interval_ms:
+            self.frame_skip = target_skip
+        
+        return self.frame_skip
+    
+    def latest_result(self):
+        """
+        Get the most recent detection result.
+        
+        Returns:
+            tuple or None: (result_id, processed_frame, detections),
+                or None if no frame has been processed yet
+        """
+        with self._infer_ready:
+            return self._result
+    
     def stop(self):
         """Stop webcam capture."""
         self.running = False
-        if self.cap is not None:
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        with self._infer_ready:
+            self._infer_ready.notify_all()
+        if self._thread is not None:
+            # The reader releases its capture on exit, even if that is
+            # after this join times out
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        elif self.cap is not None:
             self.cap.release()
-            self.cap = None
+        self.cap = None
+        if self._infer_thread is not None:
+            self._infer_thread.join(timeout=1.0)
+            self._infer_thread = None
     
     def is_running(self):
         """Check if webcam is running."""
         return self.running and self.cap is not None and self.cap.isOpened()
     
-    def read_frame(self):
+    def read_frame(self, timeout=1.0):
         """
-        Read a frame from webcam.
+        Read the latest frame from webcam.
+        
+        Waits for the capture thread to publish a frame that has not been
+        returned yet, so the same frame is never served twice.
+        
+        Args:
+            timeout (float): Maximum seconds to wait for a new frame
+                (0 returns immediately)
         
         Returns:
             tuple: (success, frame)
@@ -75,29 +373,33 @@ class WebcamProcessor:
         if not self.is_running():
             return False, None
         
-        success, frame = self.cap.read()
+        with self._frame_ready:
+            self._frame_ready.wait_for(
+                lambda: self._latest is not None or self._read_failed or not self.running,
+                timeout=timeout
+            )
+            frame = self._latest
+            self._latest = None
         
-        if not success:
+        if frame is None:
             return False, None
         
         # Resize IP webcam frames to match laptop camera resolution
-        if isinstance(self.camera_index, str):  # IP webcam URL
-            target_width = config.WEBCAM_WIDTH
-            target_height = config.WEBCAM_HEIGHT
+        if self.is_ip_webcam:
+            target_width, target_height = _WEBCAM_SIZE
             
-            # Only resize if frame is larger than target
+            # Only resize (downscale) if frame is larger than target
             h, w = frame.shape[:2]
             if w > target_width or h > target_height:
-                frame = cv2.resize(frame, (target_width, target_height))
+                captured = frame
+                frame = cv2.resize(captured, _WEBCAM_SIZE, interpolation=cv2.INTER_AREA)
+                # Only the resized copy is handed out, so the capture is free
+                self._release_buffer(captured)
         
         # Update FPS
-        self.frame_count += 1
-        if self.frame_count % 10 == 0:
-            current_time = time.time()
-            self.fps = 10 / (current_time - self.last_time)
-            self.last_time = current_time
+        self._frame_times.append(time.perf_counter())
         
-        return success, frame
+        return True, frame
     
     def process_frame(self, frame, enable_detection=True, conf_threshold=0.5):
         """
@@ -111,28 +413,55 @@ class WebcamProcessor:
         Returns:
             tuple: (processed_frame, detections)
         """
-        if not enable_detection or self.model is None:
-            return frame.copy(), []
+        if not enable_detection or self.fast_model is None:
+            return frame, []
         
         try:
-            # Run detection (detect_objects loads model internally)
+            # Downscale once to the inference size (aspect preserved)
+            h, w = frame.shape[:2]
+            scale = _INFERENCE_SIZE / max(h, w)
+            if scale < 1:
+                small = cv2.resize(frame, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+            else:
+                small, scale = frame, 1.0
+            
+            # Run detection on the fast handle grabbed at construction
             detections = detect_objects(
-                frame,
-                conf_threshold=conf_threshold
+                small,
+                conf_threshold=conf_threshold,
+                model=self.fast_model
             )
             
-            # Draw boxes on frame
-            processed_frame = draw_boxes(frame, detections)
+            # Map boxes back to full-resolution frame coordinates
+            if scale != 1.0:
+                inv = 1.0 / scale
+                for det in detections:
+                    x1, y1, x2, y2 = det['bbox']
+                    det['bbox'] = (int(x1 * inv), int(y1 * inv), int(x2 * inv), int(y2 * inv))
+            
+            # Nothing to draw: show the frame itself rather than a copy
+            if not detections:
+                return frame, detections
+            
+            # Draw boxes on a copy (the clean frame is kept for snapshots);
+            # drop labels when the display is struggling
+            fps = self.get_fps()
+            show_labels = fps == 0.0 or fps >= _LABEL_MIN_FPS
+            processed_frame = draw_boxes_fast(frame, detections, show_labels=show_labels)
             
             return processed_frame, detections
             
         except Exception as e:
             print(f"Error processing frame: {e}")
-            return frame.copy(), []
+            return frame, []
     
     def get_fps(self):
-        """Get current FPS."""
-        return self.fps
+        """Get current FPS (rolling average over the last 30 frames)."""
+        times = self._frame_times
+        if len(times) < 2:
+            return 0.0
+        elapsed = times[-1] - times[0]
+        return (len(times) - 1) / elapsed if elapsed > 0 else 0.0
     
     def __del__(self):
         """Cleanup on deletion."""
@@ -3,13 +3,120 @@ YOLO Detection Engine
 Handles model loading, object detection, and bounding box visualization
 """
 
-import streamlit as st
+import os
+import logging
+import threading
+import weakref
 import cv2
 import numpy as np
+import torch
 from ultralytics import YOLO
 from pathlib import Path
+from operator import itemgetter
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
 import config
 
+# Streamlit is optional so this module also works from scripts/benchmarks
+try:
+    import streamlit as st
+except ImportError:
+    _log = logging.getLogger(__name__)
+    
+    class _NoStreamlit:
+        """Logging stand-in for the few Streamlit calls used here."""
+        
+        @staticmethod
+        def cache_resource(func):
+            return lru_cache(maxsize=1)(func)
+        
+        @staticmethod
+        def success(message, **kwargs):
+            _log.info(message)
+        
+        @staticmethod
+        def error(message, **kwargs):
+            _log.error(message)
+        
+        @staticmethod
+        def warning(message, **kwargs):
+            _log.warning(message)
+    
+    st = _NoStreamlit()
+
+
+# Workaround for PyTorch 2.6+ weights_only issue (must be set before loading)
+os.environ['TORCH_FORCE_WEIGHTS_ONLY_LOAD'] = '0'
+
+# Input sizes are fixed by INFERENCE_SIZE, so let cuDNN pick the fastest kernels once
+torch.backends.cudnn.benchmark = True
+
+# (class_ids, confidences, xyxy) for a result with no boxes
+_EMPTY_ARRAYS = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32), np.empty((0, 4), dtype=np.int32))
+
+# Ultralytics predict() is not thread-safe and the cached models are shared
+# by the webcam worker and page reruns, so each model gets its own lock
+_predict_locks = weakref.WeakKeyDictionary()
+_predict_locks_guard = threading.Lock()
+
+# Every species the model is configured for
+_ALL_SPECIES = frozenset(config.CLASS_NAMES.values())
+
+
+@contextmanager
+def _full_torch_load():
+    """Temporarily force torch.load(weights_only=False) for YOLO checkpoints."""
+    original_torch_load = torch.load
+    
+    def patched_torch_load(*args, **kwargs):
+        # Force weights_only=False for YOLO model compatibility
+        kwargs['weights_only'] = False
+        return original_torch_load(*args, **kwargs)
+    
+    torch.load = patched_torch_load
+    try:
+        yield
+    finally:
+        # Restore original torch.load
+        torch.load = original_torch_load
+
+
+def _warm_up(model):
+    """
+    Run one dummy inference so the first real frame doesn't pay for
+    backend initialization (cuDNN autotuning, CUDA/ONNX/TensorRT allocations).
+    
+    Args:
+        model (YOLO): Freshly loaded model
+    """
+    try:
+        dummy = np.zeros((config.INFERENCE_SIZE, config.INFERENCE_SIZE, 3), dtype=np.uint8)
+        model.predict(dummy, imgsz=config.INFERENCE_SIZE, device=config.DEVICE, half=config.HALF_PRECISION, verbose=False)
+        
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+    
+    except Exception as e:
+        print(f"Model warm-up skipped: {e}")
+
+
+def _predict_lock(model):
+    """
+    Get the lock that serializes predict() calls on a model instance.
+    
+    Args:
+        model (YOLO): Loaded model
+        
+    Returns:
+        threading.Lock: Lock for this model
+    """
+    with _predict_locks_guard:
+        lock = _predict_locks.get(model)
+        if lock is None:
+            lock = _predict_locks[model] = threading.Lock()
+        return lock
+
 
 @st.cache_resource
 def load_model():
@@ -21,29 +128,8 @@ def load_model():
         YOLO: Loaded YOLO model
     """
     try:
-        import torch
-        import os
-        
-        # Workaround for PyTorch 2.6+ weights_only issue
-        # Set environment variable before loading
-        os.environ['TORCH_FORCE_WEIGHTS_ONLY_LOAD'] = '0'
-        
-        # Also monkey-patch torch.load to use weights_only=False
-        original_torch_load = torch.load
-        
-        def patched_torch_load(*args, **kwargs):
-            # Force weights_only=False for YOLO model compatibility
-            kwargs['weights_only'] = False
-            return original_torch_load(*args, **kwargs)
-        
-        # Temporarily replace torch.load
-        torch.load = patched_torch_load
-        
-        try:
+        with _full_torch_load():
             model = YOLO(str(config.MODEL_PATH))
-        finally:
-            # Restore original torch.load
-            torch.load = original_torch_load
         
         # Verify model loaded correctly
         if model is None:
@@ -52,7 +138,11 @@ def load_model():
         if not hasattr(model, 'names') or model.names is None or len(model.names) == 0:
             raise ValueError("Model loaded but has no class names")
         
-        st.success(f"✅ YOLO model loaded! Detecting: {', '.join(model.names.values())}")
+        _warm_up(model)
+        
+        # Logged rather than st.success: cached functions replay their
+        # elements on every cache hit, i.e. every rerun and webcam frame
+        print(f"✅ YOLO model loaded! Detecting: {', '.join(model.names.values())}")
         return model
         
     except Exception as e:
@@ -78,13 +168,61 @@ def load_model():
         return None
 
 
-def detect_objects(image, conf_threshold=0.5):
+@st.cache_resource
+def load_fast_model():
+    """
+    Load an optimized export of the model for the real-time webcam path.
+    
+    On CUDA this is a TensorRT FP16 engine; otherwise an ONNX export. The
+    export is created next to the PyTorch weights on first use and reused
+    afterwards. Falls back to the regular model if exporting or loading
+    fails.
+    
+    Returns:
+        YOLO: TensorRT/ONNX-backed model, or the PyTorch model as fallback
+    """
+    if not config.USE_FAST_MODEL:
+        return load_model()
+    
+    try:
+        use_tensorrt = config.DEVICE != "cpu" and torch.cuda.is_available()
+        
+        if use_tensorrt:
+            export_path = config.TRT_ENGINE_PATH
+            export_args = {"format": "engine", "half": True, "workspace": 4}
+        else:
+            export_path = config.FAST_MODEL_PATH
+            export_args = {"format": "onnx", "half": config.HALF_PRECISION}
+        
+        if not export_path.exists():
+            base_model = load_model()
+            if base_model is None:
+                return None
+            export_path = Path(base_model.export(
+                imgsz=config.INFERENCE_SIZE,
+                device=config.DEVICE,
+                verbose=False,
+                **export_args
+            ))
+        
+        fast_model = YOLO(str(export_path), task="detect")
+        _warm_up(fast_model)
+        return fast_model
+    
+    except Exception as e:
+        print(f"Fast model unavailable, using PyTorch model: {e}")
+        return load_model()
+
+
+def detect_objects(image, conf_threshold=0.5, model=None):
     """
     Run YOLO detection on an image.
     
     Args:
-        image (np.ndarray): Input image (BGR or RGB)
+        image (np.ndarray): Input image (BGR)
         conf_threshold (float): Confidence threshold for detections
+        model (YOLO, optional): Already-loaded model handle; defaults to
+            the cached load_model() instance
         
     Returns:
         list: List of detections, each containing:
@@ -93,62 +231,196 @@ def detect_objects(image, conf_threshold=0.5):
             - confidence (float)
             - bbox (tuple): (x1, y1, x2, y2)
     """
-    model = load_model()
-    if model is None:
+    try:
+        arrays = _raw_detect(image, conf_threshold, model)
+    except Exception as e:
+        st.error(f"Detection error: {e}")
         return []
     
-    try:
-        # Run inference
+    if arrays is None:
+        return []
+    
+    return _build_detections(*arrays)
+
+
+def _raw_detect(image, conf_threshold, model=None):
+    """
+    Run inference and return the boxes as NumPy arrays.
+    
+    Args:
+        image (np.ndarray): Input image (BGR)
+        conf_threshold (float): Confidence threshold for detections
+        model (YOLO, optional): Already-loaded model handle
+        
+    Returns:
+        tuple or None: (class_ids int32 (N,), confidences (N,), xyxy int32 (N, 4)),
+            or None if no model is available
+    """
+    if model is None:
+        model = load_model()
+    if model is None:
+        return None
+    
+    # Run inference, one predict() at a time per model
+    with _predict_lock(model), torch.inference_mode():
         results = model.predict(
             image,
             conf=conf_threshold,
             imgsz=config.INFERENCE_SIZE,
             device=config.DEVICE,
+            half=config.HALF_PRECISION,
             verbose=False
         )
+        parsed = [_result_arrays(result) for result in results]
+    
+    if len(parsed) == 1:
+        return parsed[0]
+    if not parsed:
+        return _EMPTY_ARRAYS
+    return tuple(np.concatenate(parts) for parts in zip(*parsed))
+
+
+def _result_arrays(result):
+    """
+    Extract one Ultralytics result's boxes as NumPy arrays.
+    
+    Args:
+        result: Ultralytics Results object for a single image
         
-        detections = []
+    Returns:
+        tuple: (class_ids int32 (N,), confidences (N,), xyxy int32 (N, 4))
+    """
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return _EMPTY_ARRAYS
+    
+    data = boxes.data
+    if data.shape[1] == 6:
+        # One device-to-host copy of the whole (N, 6) xyxy/conf/cls block
+        rows = data.cpu().numpy()
+        return rows[:, 5].astype(np.int32), rows[:, 4], rows[:, :4].astype(np.int32)
+    
+    # One device-to-host copy per tensor instead of per box and attribute
+    classes = boxes.cls.cpu().numpy().astype(np.int32)
+    confidences = boxes.conf.cpu().numpy()
+    xyxy = boxes.xyxy.cpu().numpy().astype(np.int32)
+    return classes, confidences, xyxy
+
+
+def _build_detections(class_ids, confidences, xyxy):
+    """
+    Build detection dictionaries from box arrays.
+    
+    Args:
+        class_ids (np.ndarray): Class ids, shape (N,)
+        confidences (np.ndarray): Confidence scores, shape (N,)
+        xyxy (np.ndarray): Boxes, shape (N, 4)
         
-        # Parse results
-        for result in results:
-            boxes = result.boxes
-            
-            for box in boxes:
-                # Extract box information
-                class_id = int(box.cls[0])
-                confidence = float(box.conf[0])
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                
-                # Get class name
-                class_name = config.CLASS_NAMES.get(class_id, f"Class_{class_id}")
-                
-                detections.append({
-                    'class_id': class_id,
-                    'class_name': class_name,
-                    'confidence': confidence,
-                    'bbox': (int(x1), int(y1), int(x2), int(y2))
-                })
-        
-        return detections
+    Returns:
+        list: Detections in the detect_objects format
+    """
+    detections = []
+    names = config.CLASS_NAMES
     
-    except Exception as e:
-        st.error(f"Detection error: {e}")
-        return []
+    # Convert each array to Python scalars in one C-level tolist() call
+    xyxy = np.ascontiguousarray(xyxy).astype(np.int32, copy=False)
+    
+    for class_id, confidence, bbox in zip(class_ids.tolist(), confidences.tolist(), xyxy.tolist()):
+        detections.append({
+            'class_id': class_id,
+            'class_name': names.get(class_id, f"Class_{class_id}"),
+            'confidence': confidence,
+            'bbox': tuple(bbox)
+        })
+    
+    return detections
+
+
+def detect_objects_raw(image, model=None):
+    """
+    Run one detection pass at the lowest verification threshold.
+    
+    Confidence thresholds only filter the model's output, so Layer 1 and
+    Layer 2 detections can both be filtered from this single result.
+    
+    Args:
+        image (np.ndarray): Input image (BGR or RGB)
+        model (YOLO, optional): Already-loaded model handle
+        
+    Returns:
+        list: Detections with confidence >= min(LAYER1, LAYER2)
+    """
+    min_conf = min(config.LAYER1_CONFIDENCE, config.LAYER2_CONFIDENCE)
+    return detect_objects(image, conf_threshold=min_conf, model=model)
+
+
+# Label font settings shared by draw_boxes and draw_boxes_fast
+_LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_LABEL_SCALE = 1.2
+_LABEL_THICKNESS = 2
+
+
+@lru_cache(maxsize=64)
+def _label_size(class_name, show_confidence=True):
+    """
+    Get the (width, height) of a class label's text, computed once per class.
+    
+    With confidence shown, the size is measured with the widest suffix
+    (" 100.0%") so the background always covers the actual text.
+    
+    Args:
+        class_name (str): Species name
+        show_confidence (bool): Whether the label carries a percentage
+        
+    Returns:
+        tuple: (text_width, text_height)
+    """
+    label = f"{class_name} 100.0%" if show_confidence else class_name
+    (text_width, text_height), _ = cv2.getTextSize(label, _LABEL_FONT, _LABEL_SCALE, _LABEL_THICKNESS)
+    return text_width, text_height
 
 
-def draw_boxes(image, detections, show_confidence=True):
+def _fill_label_background(image, x0, y0, x1, y1, color):
+    """
+    Fill an inclusive rectangle with a solid color, clipped to the image.
+    
+    Same pixels as cv2.rectangle(..., thickness=-1), written as one NumPy
+    slice assignment.
+    """
+    height, width = image.shape[:2]
+    x0, y0 = max(x0, 0), max(y0, 0)
+    x1, y1 = min(x1, width - 1), min(y1, height - 1)
+    if x0 <= x1 and y0 <= y1:
+        image[y0:y1 + 1, x0:x1 + 1] = color
+
+
+def _output_buffer(image, out, inplace):
+    """Pick the array to draw on: image itself, a reused buffer, or a copy."""
+    if inplace:
+        return image
+    if out is not None and out.shape == image.shape and out.dtype == image.dtype:
+        np.copyto(out, image)
+        return out
+    return image.copy()
+
+
+def draw_boxes(image, detections, show_confidence=True, out=None, inplace=False):
     """
     Draw bounding boxes on image with labels and confidence scores.
     
     Args:
-        image (np.ndarray): Input image (BGR format)
+        image (np.ndarray): Input image (BGR)
         detections (list): List of detection dictionaries
         show_confidence (bool): Whether to show confidence percentage
+        out (np.ndarray, optional): Preallocated buffer (same shape/dtype)
+            to draw into instead of allocating a copy
+        inplace (bool): Draw directly on image
         
     Returns:
         np.ndarray: Image with drawn bounding boxes
     """
-    output_image = image.copy()
+    output_image = _output_buffer(image, out, inplace)
+    colors = config.CLASS_COLORS
     
     for det in detections:
         class_name = det['class_name']
@@ -156,11 +428,11 @@ def draw_boxes(image, detections, show_confidence=True):
         x1, y1, x2, y2 = det['bbox']
         
         # Get class-specific color (BGR format)
-        color = config.CLASS_COLORS.get(class_name, (0, 255, 0))
+        color = colors.get(class_name, (0, 255, 0))
         
         # Draw bounding box (THICKER for better visibility)
         thickness = 6
-        cv2.rectangle(output_image, (x1, y1), (x2, y2), color, thickness)
+        cv2.rectangle(output_image, (x1, y1), (x2, y2), color, thickness, cv2.LINE_8)
         
         # Prepare label text
         if show_confidence:
@@ -168,57 +440,91 @@ def draw_boxes(image, detections, show_confidence=True):
         else:
             label = f"{class_name}"
         
-        # Calculate label background size (BIGGER text for better visibility)
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 1.2
-        font_thickness = 3
-        (text_width, text_height), baseline = cv2.getTextSize(
-            label, font, font_scale, font_thickness
-        )
+        # Label background size (BIGGER text for better visibility), cached per class
+        text_width, text_height = _label_size(class_name, show_confidence)
         
-        # Draw label background
-        cv2.rectangle(
-            output_image,
-            (x1, y1 - text_height - 10),
-            (x1 + text_width + 10, y1),
-            color,
-            -1  # Filled rectangle
-        )
+        # Draw label background (filled rectangle as a slice assignment)
+        _fill_label_background(output_image, x1, y1 - text_height - 10, x1 + text_width + 10, y1, color)
         
         # Draw label text
         cv2.putText(
             output_image,
             label,
             (x1 + 5, y1 - 5),
-            font,
-            font_scale,
+            _LABEL_FONT,
+            _LABEL_SCALE,
             (255, 255, 255),  # White text
-            font_thickness
+            _LABEL_THICKNESS,
+            cv2.LINE_8
         )
     
     return output_image
 
 
-def get_detection_summary(detections):
+# Box colors indexed by class_id (BGR), built once from config
+_COLOR_LUT = tuple(
+    config.CLASS_COLORS.get(config.CLASS_NAMES.get(class_id), (0, 255, 0))
+    for class_id in range(max(config.CLASS_NAMES) + 1)
+)
+
+
+def draw_boxes_fast(image, detections, show_labels=True, out=None, inplace=False):
     """
-    Generate a summary of detections.
+    Draw bounding boxes for the real-time path with minimal per-box overhead.
+    
+    Same look as draw_boxes (BGR only), but colors come from a class_id
+    lookup table and cv2 calls are bound to locals for the loop.
     
     Args:
+        image (np.ndarray): Input image (BGR)
         detections (list): List of detection dictionaries
+        show_labels (bool): Draw the label box and text; skip under load
+        out (np.ndarray, optional): Preallocated buffer to draw into
+        inplace (bool): Draw directly on image
         
     Returns:
-        dict: Summary with counts per species
+        np.ndarray: Image with drawn bounding boxes
     """
-    summary = {}
+    output_image = _output_buffer(image, out, inplace)
+    
+    rectangle = cv2.rectangle
+    put_text = cv2.putText
+    label_size = _label_size
+    fill_label = _fill_label_background
+    font = _LABEL_FONT
+    line_8 = cv2.LINE_8
+    lut = _COLOR_LUT
+    lut_size = len(lut)
     
     for det in detections:
-        species = det['class_name']
-        if species in summary:
-            summary[species] += 1
-        else:
-            summary[species] = 1
+        class_id = det['class_id']
+        color = lut[class_id] if 0 <= class_id < lut_size else (0, 255, 0)
+        x1, y1, x2, y2 = det['bbox']
+        
+        rectangle(output_image, (x1, y1), (x2, y2), color, 6, line_8)
+        
+        if show_labels:
+            class_name = det['class_name']
+            label = f"{class_name} {det['confidence']:.1%}"
+            text_width, text_height = label_size(class_name)
+            fill_label(output_image, x1, y1 - text_height - 10, x1 + text_width + 10, y1, color)
+            put_text(output_image, label, (x1 + 5, y1 - 5), font, _LABEL_SCALE, (255, 255, 255), _LABEL_THICKNESS, line_8)
     
-    return summary
+    return output_image
+
+
+def get_detection_summary(detections):
+    """
+    Generate a summary of detections.
+    
+    Args:
+        detections (list): List of detection dictionaries
+        
+    Returns:
+        dict: Summary with counts per species
+    """
+    # Counter's counting loop runs in C
+    return dict(Counter(map(itemgetter('class_name'), detections)))
 
 
 def get_highest_confidence_detection(detections):
@@ -234,7 +540,28 @@ def get_highest_confidence_detection(detections):
     if not detections:
         return None
     
-    return max(detections, key=lambda x: x['confidence'])
+    return max(detections, key=itemgetter('confidence'))
+
+
+def get_best_detection_per_species(detections):
+    """
+    Get the highest-confidence detection for each species in one pass.
+    
+    Args:
+        detections (list): List of detection dictionaries
+        
+    Returns:
+        dict: Species name -> detection with highest confidence
+    """
+    best = {}
+    
+    for det in detections:
+        species = det['class_name']
+        current = best.get(species)
+        if current is None or det['confidence'] > current['confidence']:
+            best[species] = det
+    
+    return best
 
 
 def filter_detections_by_species(detections, species_list):
@@ -248,4 +575,11 @@ def filter_detections_by_species(detections, species_list):
     Returns:
         list: Filtered detections
     """
-    return [det for det in detections if det['class_name'] in species_list]
+    wanted = frozenset(species_list)
+    
+    if not wanted:
+        return []
+    if wanted >= _ALL_SPECIES:
+        return list(detections)
+    
+    return [det for det in detections if det['class_name'] in wanted]